@@ -2,30 +2,316 @@
 Shared utilities for all graphics.
 """
 
+import gzip
+import json
+import os
 import pickle
+import struct
+import tempfile
+from collections.abc import Mapping
 from pathlib import Path
 
+# Give matplotlib a writable font/config cache so it doesn't rebuild the
+# font list on every run when the home directory isn't writable
+os.environ.setdefault("MPLCONFIGDIR", os.path.join(tempfile.gettempdir(), "mplcache"))
+
+# Graphics are only ever saved to disk, so select the headless Agg backend
+# before anything imports pyplot; this skips GUI toolkit initialization.
+# The environment variable carries the choice into subprocesses.
+os.environ["MPLBACKEND"] = "Agg"
+
+import matplotlib
+
+matplotlib.use("Agg", force=True)
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
 # Output directory
 OUTPUT_DIR = Path(__file__).parent
 
+# Figure shared by all graphs generated in this process, see get_figure()
+_figure = None
+
+# Pickled blank diagram figures keyed by (width, height), see blank_fig()
+_blank_figures = {}
+
+# Read buffer for result pickles; large enough that pickle's prefetch
+# (via BufferedReader.peek) avoids many small read() calls
+READ_BUFFER_SIZE = 1 << 20
+
+# Pickles smaller than this are read in one read_bytes() call and unpickled
+# from memory; larger ones are streamed through the buffer above
+WHOLE_READ_LIMIT = 64 << 20
+
+# Experiment name -> pickled results file
+RESULT_FILES = {
+    "exp1": OUTPUT_DIR / "exp1_results.pkl",
+    "exp2": OUTPUT_DIR / "exp2_results.pkl",
+    "exp3": OUTPUT_DIR / "exp3_results.pkl",
+}
+
+# Out-of-band pickle buffers are stored next to the pickle as
+# <name>.buffers: a sequence of (8-byte little-endian length, raw bytes)
+_BUFFER_LEN = struct.Struct("<Q")
+
+
+def _buffers_path(path):
+    return path.with_suffix(".buffers")
+
+
+def _read_buffers(path):
+    """Read the out-of-band buffers written by resave_results()."""
+    data = bytearray(path.stat().st_size)
+    view = memoryview(data)
+    with open(path, "rb", buffering=0) as f:
+        filled = 0
+        while filled < len(data):
+            n = f.readinto(view[filled:])
+            if not n:
+                raise ValueError(
+                    f"{path}: read {filled} of {len(data)} bytes (file truncated?)"
+                )
+            filled += n
+
+    buffers = []
+    offset = 0
+    while offset < len(view):
+        if offset + _BUFFER_LEN.size > len(view):
+            raise ValueError(f"{path}: truncated buffer header at byte {offset}")
+        (size,) = _BUFFER_LEN.unpack_from(view, offset)
+        offset += _BUFFER_LEN.size
+        if offset + size > len(view):
+            raise ValueError(f"{path}: truncated buffer at byte {offset}")
+        buffers.append(view[offset : offset + size])
+        offset += size
+    return buffers
+
+
+def _split_path(path):
+    return path.with_suffix(".json")
+
+
+def _to_split(obj, stem, field, arrays):
+    """Replace ndarrays in obj with {"__npy__": filename} placeholders."""
+    if isinstance(obj, np.ndarray):
+        filename = f"{stem}.{field}.npy" if field else f"{stem}.npy"
+        arrays[filename] = obj
+        return {"__npy__": filename}
+    if isinstance(obj, dict):
+        return {
+            key: _to_split(value, stem, f"{field}.{key}" if field else str(key), arrays)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return [
+            _to_split(value, stem, f"{field}.{i}" if field else str(i), arrays)
+            for i, value in enumerate(obj)
+        ]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+
+def _from_split(obj, directory):
+    """Inverse of _to_split: memory-map each placeholder's .npy file."""
+    if isinstance(obj, dict):
+        if obj.keys() == {"__npy__"}:
+            return np.load(directory / obj["__npy__"], mmap_mode="r")
+        return {key: _from_split(value, directory) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_from_split(value, directory) for value in obj]
+    return obj
+
+
+def _load_split(path):
+    with open(path, encoding="utf-8") as f:
+        return _from_split(json.load(f), path.parent)
+
+
+def save_split(name, obj):
+    """Save results as JSON metadata plus one .npy file per numpy array."""
+    path = _split_path(RESULT_FILES[name])
+    arrays = {}
+    meta = _to_split(obj, path.stem, "", arrays)
+    for filename, array in arrays.items():
+        np.save(path.parent / filename, array)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    print(f"Saved: {path}")
+
+
+def load_split(name):
+    """Load results written by save_split(); arrays are memory-mapped."""
+    return _load_split(_split_path(RESULT_FILES[name]))
+
+
+def _gzip_json_path(path):
+    return path.with_suffix(".json.gz")
+
+
+def _load_gzip_json(path):
+    with gzip.open(path, "rb") as f:
+        return json.loads(f.read())
+
+
+def _load_pickle(path):
+    buffers_path = _buffers_path(path)
+    buffers = _read_buffers(buffers_path) if buffers_path.exists() else None
+    if path.stat().st_size < WHOLE_READ_LIMIT:
+        return pickle.loads(path.read_bytes(), buffers=buffers)
+    with open(path, "rb", buffering=READ_BUFFER_SIZE) as f:
+        return pickle.load(f, buffers=buffers)
+
+
+class LazyResults(Mapping):
+    """Read-only mapping of experiment results, unpickled on first access.
+
+    Membership and iteration only check which result files exist, so graphs
+    that never touch an experiment never pay for deserializing it. An
+    experiment's results may exist as the JSON/.npy split format from
+    save_split(), gzipped JSON (as written by experiment 2) or a pickle;
+    the most recently written one is loaded, so an old conversion never
+    shadows newer results.
+    """
+
+    def __init__(self, paths=RESULT_FILES):
+        self._paths = dict(paths)
+        self._cache = {}
+
+    def __getitem__(self, name):
+        if name in self._cache:
+            return self._cache[name]
+        if name not in self:
+            raise KeyError(name)
+        path, load = self._newest(name)
+        value = load(path)
+        self._cache[name] = value
+        return value
+
+    def _candidates(self, name):
+        """(path, loader) of each existing results file for `name`."""
+        path = self._paths[name]
+        candidates = [
+            (_split_path(path), _load_split),
+            (_gzip_json_path(path), _load_gzip_json),
+            (path, _load_pickle),
+        ]
+        return [(p, load) for p, load in candidates if p.exists()]
+
+    def _newest(self, name):
+        # On equal times the order above decides (split, gzip JSON, pickle)
+        return max(self._candidates(name), key=lambda c: c[0].stat().st_mtime)
+
+    def __contains__(self, name):
+        return name in self._paths and bool(self._candidates(name))
+
+    def __iter__(self):
+        return (name for name in self._paths if name in self)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
 
 def load_results():
-    """Load all experiment results."""
-    results = {}
+    """Load all experiment results (lazily, see LazyResults)."""
+    return LazyResults()
+
+
+def get_figure(width, height):
+    """Return this process's shared figure, cleared and sized to (width, height).
+
+    Reusing one figure across graphs avoids re-creating the figure, canvas
+    and renderer for every graph; callers clear it with fig.clear() when done.
+    The figure is attached straight to an Agg canvas, bypassing pyplot's
+    figure manager since nothing is ever shown interactively.
+    """
+    global _figure
+    if _figure is None:
+        _figure = Figure(figsize=(width, height))
+        FigureCanvasAgg(_figure)
+    else:
+        _figure.clear()
+        _figure.set_size_inches(width, height)
+    return _figure
+
+
+def _make_blank_fig(width, height):
+    fig = Figure(figsize=(width, height))
+    fig.patch.set_facecolor("white")
+    ax = fig.add_subplot()
+    ax.set_xlim(0, width)
+    ax.set_ylim(0, height)
+    ax.axis("off")
+    return fig
+
+
+def blank_fig(width, height):
+    """Return a new figure with one hidden axes spanning (0, width) x (0, height).
+
+    Diagram-style graphs draw on this canvas. The figure is built once per
+    size and cloned from its pickled bytes on later calls instead of
+    re-running the axes setup.
+    """
+    key = (width, height)
+    if key not in _blank_figures:
+        _blank_figures[key] = pickle.dumps(_make_blank_fig(width, height))
+    fig = pickle.loads(_blank_figures[key])
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def resave_results(paths=RESULT_FILES):
+    """Rewrite existing result pickles with the highest pickle protocol.
+
+    Large contiguous buffers (e.g. numpy latency arrays) are written out of
+    band to a .buffers sidecar so loading them is zero-copy. Run it with
+    `python common.py resave` after an experiment has saved new results.
+    """
+    for path in paths.values():
+        if not path.exists():
+            continue
+        obj = _load_pickle(path)
+
+        buffers = []
+        with open(path, "wb") as f:
+            pickle.dump(
+                obj, f, protocol=pickle.HIGHEST_PROTOCOL, buffer_callback=buffers.append
+            )
+
+        buffers_path = _buffers_path(path)
+        if buffers:
+            with open(buffers_path, "wb") as f:
+                for buf in buffers:
+                    raw = buf.raw()
+                    f.write(_BUFFER_LEN.pack(raw.nbytes))
+                    f.write(raw)
+        elif buffers_path.exists():
+            buffers_path.unlink()
+        print(f"Resaved: {path}")
 
-    exp1_path = OUTPUT_DIR / "exp1_results.pkl"
-    if exp1_path.exists():
-        with open(exp1_path, "rb") as f:
-            results["exp1"] = pickle.load(f)
 
-    exp2_path = OUTPUT_DIR / "exp2_results.pkl"
-    if exp2_path.exists():
-        with open(exp2_path, "rb") as f:
-            results["exp2"] = pickle.load(f)
+if __name__ == "__main__":
+    import argparse
 
-    exp3_path = OUTPUT_DIR / "exp3_results.pkl"
-    if exp3_path.exists():
-        with open(exp3_path, "rb") as f:
-            results["exp3"] = pickle.load(f)
+    parser = argparse.ArgumentParser(
+        description="Convert saved experiment results for faster loading"
+    )
+    parser.add_argument(
+        "command",
+        choices=["resave", "split"],
+        help=(
+            "resave: rewrite result pickles with protocol 5 and .buffers "
+            "sidecars; split: save each experiment's results as JSON plus "
+            "memory-mapped .npy arrays"
+        ),
+    )
+    args = parser.parse_args()
 
-    return results
+    if args.command == "resave":
+        resave_results()
+    elif args.command == "split":
+        results = load_results()
+        for name in results:
+            save_split(name, results[name])
@@ -4,18 +4,49 @@ Generate all graphics for the TOON article.
 Run with: python graphics/generate_all.py
 """
 
+import importlib
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 from common import load_results
 
-from graph_1 import graph_1_token_breakdown
-from graph_2 import graph_2_token_counts
-from graph_3 import graph_3_savings_scaling
-from graph_4 import graph_4_accuracy
-from graph_5 import graph_5_latency
-from graph_6 import graph_6_cost_projection
-from graph_7 import graph_7_reliability
-from graph_8 import graph_8_architecture
-from graph_9 import graph_9_decision_flowchart
-from graph_10 import graph_10_summary
+# (description, module, function, experiment results it reads)
+GRAPHS = [
+    ("Graph 1: Token Breakdown Diagram", "graph_1", "graph_1_token_breakdown", ()),
+    ("Graph 2: Token Counts Bar Chart", "graph_2", "graph_2_token_counts", ("exp1",)),
+    (
+        "Graph 3: Savings Scaling Line Graph",
+        "graph_3",
+        "graph_3_savings_scaling",
+        ("exp1",),
+    ),
+    ("Graph 4: Accuracy Comparison", "graph_4", "graph_4_accuracy", ("exp2",)),
+    ("Graph 5: Latency Distribution", "graph_5", "graph_5_latency", ("exp2",)),
+    ("Graph 6: Cost Projection", "graph_6", "graph_6_cost_projection", ("exp1",)),
+    ("Graph 7: Reliability Cascade", "graph_7", "graph_7_reliability", ()),
+    ("Graph 8: Architecture Diagram", "graph_8", "graph_8_architecture", ()),
+    ("Graph 9: Decision Flowchart", "graph_9", "graph_9_decision_flowchart", ()),
+    ("Graph 10: Summary Infographic", "graph_10", "graph_10_summary", ("exp1",)),
+]
+
+# Results shared with worker processes, set by _init_worker
+_results = None
+
+
+def _init_worker(results):
+    global _results
+    _results = results
+
+
+def _generate(module_name, func_name, result_names):
+    """Import a graph module on demand and generate its graph."""
+    func = getattr(importlib.import_module(module_name), func_name)
+    if result_names:
+        func(_results)
+    else:
+        func()
 
 
 def main():
@@ -28,36 +59,32 @@ def main():
     print(f"Loaded results: {list(results.keys())}")
     print()
 
-    # Generate all graphs
-    print("Graph 1: Token Breakdown Diagram...")
-    graph_1_token_breakdown()
-
-    print("Graph 2: Token Counts Bar Chart...")
-    graph_2_token_counts(results)
-
-    print("Graph 3: Savings Scaling Line Graph...")
-    graph_3_savings_scaling(results)
-
-    print("Graph 4: Accuracy Comparison...")
-    graph_4_accuracy(results)
-
-    print("Graph 5: Latency Distribution...")
-    graph_5_latency(results)
-
-    print("Graph 6: Cost Projection...")
-    graph_6_cost_projection(results)
-
-    print("Graph 7: Reliability Cascade...")
-    graph_7_reliability(results)
-
-    print("Graph 8: Architecture Diagram...")
-    graph_8_architecture()
-
-    print("Graph 9: Decision Flowchart...")
-    graph_9_decision_flowchart()
-
-    print("Graph 10: Summary Infographic...")
-    graph_10_summary(results)
+    # Graphs are independent, so render them in parallel. Each graph module
+    # (and the matplotlib machinery it pulls in) is imported only in the
+    # worker that generates it. With fork, the results the graphs read are
+    # loaded once here and inherited by every worker; otherwise each worker
+    # gets the lazy mapping and loads only what its graph reads.
+    if sys.platform.startswith("linux"):
+        mp_context = multiprocessing.get_context("fork")
+        for name in {name for *_, names in GRAPHS for name in names}:
+            if name in results:
+                results[name]
+    else:
+        mp_context = None
+
+    with ProcessPoolExecutor(
+        max_workers=min(len(GRAPHS), os.cpu_count() or 1),
+        mp_context=mp_context,
+        initializer=_init_worker,
+        initargs=(results,),
+    ) as executor:
+        futures = [
+            (description, executor.submit(_generate, module, func, result_names))
+            for description, module, func, result_names in GRAPHS
+        ]
+        for description, future in futures:
+            future.result()
+            print(f"{description}... done")
 
     print()
     print("=" * 60)
@@ -4,16 +4,51 @@ Graph 1: Token Breakdown Diagram
 Side-by-side visualization showing token structure differences between JSON and TOON.
 """
 
-import matplotlib.pyplot as plt
+from matplotlib.collections import PatchCollection
+from matplotlib.patches import BoxStyle, FancyBboxPatch
 
 from style import COLORS, apply_style, save_figure
+from common import get_figure
+
+# Rounded box drawn behind each code line
+TEXT_BOX_STYLE = BoxStyle("Round", pad=0.4, rounding_size=0.15)
+
+
+def _text_box(text, renderer, facecolor, edgecolor, linewidth):
+    """Rounded box around a laid-out text, as `bbox=` would draw it.
+
+    The box is built in data coordinates so boxes can be drawn together in
+    one PatchCollection instead of one patch per text.
+    """
+    ax = text.axes
+    to_data = ax.transData.inverted()
+    extent = text.get_window_extent(renderer)
+    (x0, y0), (x1, y1) = to_data.transform(extent.get_points())
+
+    # Data units per pixel along each axis; the box style works in x units and
+    # mutation_aspect stretches it vertically so corners stay round on screen
+    (ox, oy), (px, py) = to_data.transform([(0, 0), (1, 1)])
+    fontsize = renderer.points_to_pixels(text.get_size())
+
+    return FancyBboxPatch(
+        (x0, y0),
+        x1 - x0,
+        y1 - y0,
+        boxstyle=TEXT_BOX_STYLE,
+        mutation_scale=fontsize * (px - ox),
+        mutation_aspect=(py - oy) / (px - ox),
+        facecolor=facecolor,
+        edgecolor=edgecolor,
+        linewidth=linewidth,
+    )
 
 
 def graph_1_token_breakdown():
     """Side-by-side visualization showing token structure differences with modern design."""
     apply_style()
 
-    fig, axes = plt.subplots(1, 2, figsize=(14, 8))
+    fig = get_figure(14, 8)
+    axes = fig.subplots(1, 2)
     fig.patch.set_facecolor("white")
 
     # JSON example with token highlights
@@ -33,6 +68,9 @@ def graph_1_token_breakdown():
         ("3,Charlie,user", "data"),
     ]
 
+    # (text, facecolor, edgecolor, linewidth) for each boxed line
+    boxes = []
+
     # Plot JSON
     ax1 = axes[0]
     ax1.set_xlim(-0.5, 12)
@@ -51,20 +89,15 @@ def graph_1_token_breakdown():
             edgecolor = COLORS["accent"]
             linewidth = 2.5
 
-        ax1.text(
+        text = ax1.text(
             0.3,
             y,
             line,
             fontfamily="monospace",
             fontsize=12,
             verticalalignment="center",
-            bbox=dict(
-                boxstyle="round,pad=0.4,rounding_size=0.15",
-                facecolor=facecolor,
-                edgecolor=edgecolor,
-                linewidth=linewidth,
-            ),
         )
+        boxes.append((text, facecolor, edgecolor, linewidth))
 
     # Add annotation for repeated keys with arrow
     ax1.annotate(
@@ -96,7 +129,7 @@ def graph_1_token_breakdown():
             textcolor = "black"
             linewidth = 1.5
 
-        ax2.text(
+        text = ax2.text(
             0.3,
             y,
             line,
@@ -104,13 +137,8 @@ def graph_1_token_breakdown():
             fontsize=12,
             verticalalignment="center",
             color=textcolor,
-            bbox=dict(
-                boxstyle="round,pad=0.4,rounding_size=0.15",
-                facecolor=facecolor,
-                edgecolor=edgecolor,
-                linewidth=linewidth,
-            ),
         )
+        boxes.append((text, facecolor, edgecolor, linewidth))
 
     # Add annotation for single header
     ax2.annotate(
@@ -122,9 +150,20 @@ def graph_1_token_breakdown():
         fontweight="bold",
     )
 
-    plt.tight_layout(pad=2)
+    fig.tight_layout(pad=2)
+
+    # Text boxes depend on the final layout, so build them after tight_layout
+    renderer = fig.canvas.get_renderer()
+    for ax in axes:
+        patches = [
+            _text_box(text, renderer, *style)
+            for text, *style in boxes
+            if text.axes is ax
+        ]
+        ax.add_collection(PatchCollection(patches, match_original=True))
+
     save_figure(fig, "../graphics/graph_1_token_breakdown")
-    plt.close()
+    fig.clear()
 
 
 if __name__ == "__main__":
@@ -4,11 +4,14 @@ Graph 10: Summary Infographic
 Three-perspective summary with key metrics - larger readable text.
 """
 
-import matplotlib.pyplot as plt
-from matplotlib.patches import FancyBboxPatch
+from matplotlib.collections import EllipseCollection, PatchCollection
+from matplotlib.patches import BoxStyle, FancyBboxPatch
 
 from style import COLORS, apply_style, save_figure
-from common import load_results
+from common import blank_fig, load_results
+
+# Rounded box behind each perspective
+PERSPECTIVE_BOX_STYLE = BoxStyle("Round", pad=0.05, rounding_size=0.15)
 
 
 def graph_10_summary(results=None):
@@ -18,11 +21,8 @@ def graph_10_summary(results=None):
     if results is None:
         results = load_results()
 
-    fig, ax = plt.subplots(figsize=(14, 10))
-    fig.patch.set_facecolor("white")
-    ax.set_xlim(0, 14)
-    ax.set_ylim(0, 10)
-    ax.axis("off")
+    fig = blank_fig(14, 10)
+    ax = fig.axes[0]
 
     # Title
     ax.text(
@@ -56,19 +56,25 @@ def graph_10_summary(results=None):
         ("Zero", "Migration\nRequired"),
     ]
 
-    for i, (value, label) in enumerate(metrics):
-        x = 2.5 + i * 4.5
-
-        # Larger circle for metric
-        circle = plt.Circle(
-            (x, 6),
-            1.3,
-            facecolor=COLORS["TOON"],
-            edgecolor="#27ae60",
-            linewidth=3,
+    metric_xs = [2.5 + i * 4.5 for i in range(len(metrics))]
+
+    # Larger circle for each metric, all drawn as one collection
+    ax.add_collection(
+        EllipseCollection(
+            widths=2.6,
+            heights=2.6,
+            angles=0,
+            units="xy",
+            offsets=[(x, 6) for x in metric_xs],
+            offset_transform=ax.transData,
+            facecolors=COLORS["TOON"],
+            edgecolors="#27ae60",
+            linewidths=3,
             alpha=0.9,
         )
-        ax.add_patch(circle)
+    )
+
+    for x, (value, label) in zip(metric_xs, metrics):
         ax.text(
             x,
             6.3,
@@ -109,6 +115,7 @@ def graph_10_summary(results=None):
         ),
     ]
 
+    rects = []
     for i, (title, benefits, color) in enumerate(perspectives):
         x = 2.5 + i * 4.5
 
@@ -117,22 +124,23 @@ def graph_10_summary(results=None):
             (x - 2, 0.5),
             4,
             3.3,
-            boxstyle="round,pad=0.05,rounding_size=0.15",
+            boxstyle=PERSPECTIVE_BOX_STYLE,
             facecolor=color,
             edgecolor="black",
             linewidth=2,
             alpha=0.3,
         )
-        ax.add_patch(rect)
+        rects.append(rect)
 
         ax.text(x, 3.4, title, ha="center", va="center", fontsize=16, fontweight="bold")
         ax.text(
             x, 1.9, benefits, ha="center", va="center", fontsize=13, linespacing=1.6
         )
 
-    plt.tight_layout(pad=1.5)
+    ax.add_collection(PatchCollection(rects, match_original=True))
+
+    fig.tight_layout(pad=1.5)
     save_figure(fig, "../graphics/graph_10_summary")
-    plt.close()
 
 
 if __name__ == "__main__":
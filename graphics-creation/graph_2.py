@@ -4,11 +4,10 @@ Graph 2: Token Counts Bar Chart
 Bar chart comparing token counts across formats and dataset sizes.
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 from style import COLORS, apply_style, save_figure
-from common import load_results
+from common import get_figure, load_results
 
 
 def graph_2_token_counts(results=None):
@@ -31,7 +30,8 @@ def graph_2_token_counts(results=None):
     x = np.arange(len(records))
     width = 0.25
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = get_figure(10, 6)
+    ax = fig.add_subplot()
 
     bars1 = ax.bar(x - width, json_tokens, width, label="JSON", color=COLORS["JSON"])
     bars2 = ax.bar(x, yaml_tokens, width, label="YAML", color=COLORS["YAML"])
@@ -59,9 +59,9 @@ def graph_2_token_counts(results=None):
 
     ax.set_ylim(0, max(json_tokens) * 1.15)
 
-    plt.tight_layout()
+    fig.tight_layout()
     save_figure(fig, "../graphics/graph_2_token_counts")
-    plt.close()
+    fig.clear()
 
 
 if __name__ == "__main__":
@@ -4,10 +4,8 @@ Graph 3: Savings Scaling Line Graph
 Line graph showing how savings scale with record count.
 """
 
-import matplotlib.pyplot as plt
-
 from style import COLORS, apply_style, save_figure
-from common import load_results
+from common import get_figure, load_results
 
 
 def graph_3_savings_scaling(results=None):
@@ -26,7 +24,8 @@ def graph_3_savings_scaling(results=None):
     toon_savings = [d["toon_savings"] for d in data]
     yaml_savings = [d["yaml_savings"] for d in data]
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = get_figure(10, 6)
+    ax = fig.add_subplot()
 
     ax.plot(
         records,
@@ -55,12 +54,17 @@ def graph_3_savings_scaling(results=None):
     ax.legend(loc="right")
 
     ax.set_ylim(0, 80)
-    ax.fill_between(records, toon_savings, alpha=0.2, color=COLORS["TOON"])
-    ax.fill_between(records, yaml_savings, alpha=0.2, color=COLORS["YAML"])
+    # Rasterize the translucent fills; the lines drawn over them stay vector
+    ax.fill_between(
+        records, toon_savings, alpha=0.2, color=COLORS["TOON"], rasterized=True
+    )
+    ax.fill_between(
+        records, yaml_savings, alpha=0.2, color=COLORS["YAML"], rasterized=True
+    )
 
-    plt.tight_layout()
+    fig.tight_layout()
     save_figure(fig, "../graphics/graph_3_savings_scaling")
-    plt.close()
+    fig.clear()
 
 
 if __name__ == "__main__":
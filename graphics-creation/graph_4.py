@@ -4,11 +4,10 @@ Graph 4: Accuracy Comparison
 Grouped bar chart comparing accuracy rates between JSON and TOON.
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 from style import COLORS, apply_style, save_figure
-from common import load_results
+from common import get_figure, load_results
 
 
 def graph_4_accuracy(results=None):
@@ -39,7 +38,8 @@ def graph_4_accuracy(results=None):
     x = np.arange(len(categories))
     width = 0.35
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = get_figure(10, 6)
+    ax = fig.add_subplot()
 
     bars1 = ax.bar(x - width / 2, json_vals, width, label="JSON", color=COLORS["JSON"])
     bars2 = ax.bar(x + width / 2, toon_vals, width, label="TOON", color=COLORS["TOON"])
@@ -63,9 +63,9 @@ def graph_4_accuracy(results=None):
                 fontsize=9,
             )
 
-    plt.tight_layout()
+    fig.tight_layout()
     save_figure(fig, "../graphics/graph_4_accuracy")
-    plt.close()
+    fig.clear()
 
 
 if __name__ == "__main__":
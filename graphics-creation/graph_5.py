@@ -4,11 +4,10 @@ Graph 5: Latency Distribution
 Box plot comparing response latency distributions between JSON and TOON.
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 from style import COLORS, apply_style, save_figure
-from common import load_results
+from common import get_figure, load_results
 
 
 def graph_5_latency(results=None):
@@ -26,8 +25,13 @@ def graph_5_latency(results=None):
 
     json_latencies = summary["JSON"]["latencies"]
     toon_latencies = summary["TOON"]["latencies"]
+    if not json_latencies or not toon_latencies:
+        # Batch API runs don't measure per-request latency
+        print("Skipping Graph 5: No latencies in experiment 2 results")
+        return
 
-    fig, ax = plt.subplots(figsize=(8, 6))
+    fig = get_figure(8, 6)
+    ax = fig.add_subplot()
 
     data = [json_latencies, toon_latencies]
     positions = [1, 2]
@@ -72,9 +76,9 @@ def graph_5_latency(results=None):
         color=COLORS["TOON"],
     )
 
-    plt.tight_layout()
+    fig.tight_layout()
     save_figure(fig, "../graphics/graph_5_latency")
-    plt.close()
+    fig.clear()
 
 
 if __name__ == "__main__":
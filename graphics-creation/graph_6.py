@@ -4,11 +4,10 @@ Graph 6: Cost Projection
 Area chart showing cumulative cost savings over time.
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 from style import COLORS, apply_style, save_figure
-from common import load_results
+from common import get_figure, load_results
 
 
 def graph_6_cost_projection(results=None):
@@ -36,24 +35,27 @@ def graph_6_cost_projection(results=None):
     cost_per_1k = 0.01  # $0.01 per 1K tokens
     months = np.arange(1, 13)
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = get_figure(10, 6)
+    ax = fig.add_subplot()
 
     colors = [COLORS["TOON"], COLORS["YAML"], COLORS["JSON"]]
     alphas = [0.8, 0.5, 0.3]
 
-    for i, (label, monthly_tokens) in enumerate(volumes.items()):
-        monthly_cost_json = (monthly_tokens / 1000) * cost_per_1k
-        monthly_savings = monthly_cost_json * savings_rate
-        cumulative_savings = months * monthly_savings
+    # Cumulative savings in $K for every volume (rows) and month (columns)
+    monthly_tokens = np.array(list(volumes.values()))
+    monthly_savings = (monthly_tokens / 1000) * cost_per_1k * savings_rate
+    cumulative_savings = months[None, :] * monthly_savings[:, None] / 1000
 
+    for i, label in enumerate(volumes):
         ax.fill_between(
             months,
-            cumulative_savings / 1000,
+            cumulative_savings[i],
             alpha=alphas[i],
             color=colors[i],
-            label=f"{label}: ${cumulative_savings[-1]/1000:.0f}K/year",
+            label=f"{label}: ${cumulative_savings[i, -1]:.0f}K/year",
+            rasterized=True,
         )
-        ax.plot(months, cumulative_savings / 1000, color=colors[i], linewidth=2)
+        ax.plot(months, cumulative_savings[i], color=colors[i], linewidth=2)
 
     ax.set_xlabel("Month")
     ax.set_ylabel("Cumulative Savings ($K)")
@@ -62,9 +64,9 @@ def graph_6_cost_projection(results=None):
     ax.set_xlim(1, 12)
     ax.set_xticks(months)
 
-    plt.tight_layout()
+    fig.tight_layout()
     save_figure(fig, "../graphics/graph_6_cost_projection")
-    plt.close()
+    fig.clear()
 
 
 if __name__ == "__main__":
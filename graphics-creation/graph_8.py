@@ -4,17 +4,21 @@ Graph 8: Architecture Diagram
 Pipeline diagram showing where TOON fits in the stack.
 """
 
-import matplotlib.pyplot as plt
-from matplotlib.patches import FancyBboxPatch
+from matplotlib.patches import BoxStyle, FancyBboxPatch
 
 from style import COLORS, apply_style, save_figure
+from common import get_figure
+
+# Rounded box for each pipeline stage
+STAGE_BOX_STYLE = BoxStyle("Round", pad=0.05, rounding_size=0.2)
 
 
 def graph_8_architecture():
     """Pipeline diagram showing where TOON fits in the stack."""
     apply_style()
 
-    fig, ax = plt.subplots(figsize=(14, 4))
+    fig = get_figure(14, 4)
+    ax = fig.add_subplot()
     ax.set_xlim(0, 14)
     ax.set_ylim(0, 4)
     ax.axis("off")
@@ -32,7 +36,7 @@ def graph_8_architecture():
             (x, y),
             w,
             h,
-            boxstyle="round,pad=0.05,rounding_size=0.2",
+            boxstyle=STAGE_BOX_STYLE,
             facecolor=color,
             edgecolor="black",
             linewidth=2,
@@ -68,9 +72,9 @@ def graph_8_architecture():
         y=1.05,
     )
 
-    plt.tight_layout()
+    fig.tight_layout()
     save_figure(fig, "../graphics/graph_8_architecture")
-    plt.close()
+    fig.clear()
 
 
 if __name__ == "__main__":
@@ -4,21 +4,23 @@ Graph 9: Decision Flowchart
 Flowchart for format selection - horizontal layout with large text.
 """
 
-import matplotlib.pyplot as plt
-from matplotlib.patches import FancyBboxPatch
+from matplotlib.collections import PathCollection
+from matplotlib.patches import BoxStyle, FancyBboxPatch
+from matplotlib.path import Path
 
 from style import COLORS, apply_style, save_figure
+from common import blank_fig
+
+# Rounded box for the start and result boxes
+BOX_STYLE = BoxStyle("Round", pad=0.03, rounding_size=0.2)
 
 
 def graph_9_decision_flowchart():
     """Flowchart for format selection - horizontal layout with large text."""
     apply_style()
 
-    fig, ax = plt.subplots(figsize=(20, 10))
-    fig.patch.set_facecolor("white")
-    ax.set_xlim(0, 20)
-    ax.set_ylim(0, 10)
-    ax.axis("off")
+    fig = blank_fig(20, 10)
+    ax = fig.axes[0]
 
     # Title at top
     ax.text(
@@ -47,7 +49,7 @@ def graph_9_decision_flowchart():
             (x - w / 2, y - h / 2),
             w,
             h,
-            boxstyle="round,pad=0.03,rounding_size=0.2",
+            boxstyle=BOX_STYLE,
             facecolor=COLORS["dark"],
             edgecolor=COLORS["dark"],
             linewidth=3,
@@ -64,17 +66,37 @@ def graph_9_decision_flowchart():
             color="white",
         )
 
+    # Diamonds and result boxes repeat the same shape at different centers:
+    # build each path once, translate copies, and draw each kind as one
+    # PathCollection (see the end of this function)
+    diamond_w, diamond_h = 1.8, 1.5
+    diamond_path = Path(
+        [
+            (-diamond_w, 0),
+            (0, diamond_h),
+            (diamond_w, 0),
+            (0, -diamond_h),
+            (-diamond_w, 0),
+        ],
+        closed=True,
+    )
+    result_w, result_h = 2.6, 1.1
+    result_path = FancyBboxPatch(
+        (-result_w / 2, -result_h / 2),
+        result_w,
+        result_h,
+        boxstyle=BOX_STYLE,
+    ).get_path()
+
+    diamonds = []
+    result_boxes = []  # (path, facecolor, edgecolor)
+
+    def moved(path, x, y):
+        return Path(path.vertices + (x, y), path.codes)
+
     def draw_diamond(x, y, text):
         """Draw a decision diamond."""
-        w, h = 1.8, 1.5
-        diamond = plt.Polygon(
-            [(x - w, y), (x, y + h), (x + w, y), (x, y - h)],
-            facecolor="#bdc3c7",
-            edgecolor="#7f8c8d",
-            linewidth=2.5,
-            alpha=0.9,
-        )
-        ax.add_patch(diamond)
+        diamonds.append(moved(diamond_path, x, y))
         ax.text(
             x,
             y,
@@ -88,17 +110,8 @@ def graph_9_decision_flowchart():
 
     def draw_result_box(x, y, text, color):
         """Draw a result box."""
-        w, h = 2.6, 1.1
-        rect = FancyBboxPatch(
-            (x - w / 2, y - h / 2),
-            w,
-            h,
-            boxstyle="round,pad=0.03,rounding_size=0.2",
-            facecolor=color,
-            edgecolor="black" if color != COLORS["TOON"] else "#27ae60",
-            linewidth=3,
-        )
-        ax.add_patch(rect)
+        edgecolor = "black" if color != COLORS["TOON"] else "#27ae60"
+        result_boxes.append((moved(result_path, x, y), color, edgecolor))
         textcolor = "white" if color == COLORS["TOON"] else "black"
         ax.text(
             x,
@@ -159,9 +172,29 @@ def graph_9_decision_flowchart():
     # D3 -> TOON (right, Yes)
     draw_arrow(d3_x + 1.8, d3_y, toon_x - 1.3, toon_y, "Yes", (0, 0.4))
 
-    plt.tight_layout(pad=1)
+    ax.add_collection(
+        PathCollection(
+            diamonds,
+            facecolors="#bdc3c7",
+            edgecolors="#7f8c8d",
+            linewidths=2.5,
+            alpha=0.9,
+            joinstyle="miter",
+        )
+    )
+    paths, facecolors, edgecolors = zip(*result_boxes)
+    ax.add_collection(
+        PathCollection(
+            paths,
+            facecolors=facecolors,
+            edgecolors=edgecolors,
+            linewidths=3,
+            joinstyle="miter",
+        )
+    )
+
+    fig.tight_layout(pad=1)
     save_figure(fig, "../graphics/graph_9_decision_flowchart")
-    plt.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+"""
+Retry policy for transient OpenAI API errors.
+
+Rate limits (429), connection problems and server errors (5xx) are retried
+with exponential backoff. Anything else is a permanent error and is raised
+immediately, and so is a transient error that outlasts every attempt.
+"""
+
+import openai
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+TRANSIENT_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,  # includes timeouts
+    openai.InternalServerError,
+)
+
+# Decorator for functions (sync or async) that make one API request
+retry_transient = retry(
+    retry=retry_if_exception_type(TRANSIENT_ERRORS),
+    wait=wait_random_exponential(min=1, max=60),
+    stop=stop_after_attempt(6),
+    reraise=True,
+)
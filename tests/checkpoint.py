@@ -0,0 +1,61 @@
+"""
+JSON-lines checkpoints for experiment runs.
+
+Each completed result is appended as one line as soon as it is available,
+so an interrupted run can be resumed without repeating finished API calls.
+"""
+
+from pathlib import Path
+from typing import Dict, List
+
+import orjson
+
+
+class Checkpoint:
+    """Append-only JSON-lines log of completed results.
+
+    `records` holds the results written by a previous, interrupted run.
+    A partially written last line (e.g. from a crash mid-write) is dropped.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.records: List[Dict] = []
+        self._file = None
+
+        if path.exists():
+            self._load()
+
+    def _load(self) -> None:
+        good_size = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    self.records.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    break
+                good_size += len(line)
+
+        if good_size < self.path.stat().st_size:
+            # Drop the partial line so new records start on a line of their own
+            with open(self.path, "r+b") as f:
+                f.truncate(good_size)
+
+    def append(self, record: Dict) -> None:
+        """Write one result and flush it to disk."""
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        self._file.write(orjson.dumps(record) + b"\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Delete the checkpoint once the run's results are saved."""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -103,6 +103,8 @@ PRODUCT_ADJECTIVES = [
 ]
 PRODUCT_NOUNS = ["Widget", "Gadget", "Device", "Tool", "System", "Kit", "Set", "Pack"]
 
+EMAIL_DOMAINS = ["example.com", "test.org", "demo.net", "sample.io"]
+
 
 def generate_name(rng: random.Random) -> str:
     """Generate a realistic full name (~12 characters average)."""
@@ -111,19 +113,18 @@ def generate_name(rng: random.Random) -> str:
     return f"{first} {last}"
 
 
-def generate_email(name: str, rng: random.Random) -> str:
-    """Generate email from name."""
-    # Convert name to email format
-    parts = name.lower().split()
-    domains = ["example.com", "test.org", "demo.net", "sample.io"]
-    domain = rng.choice(domains)
+def generate_email(first: str, last: str, rng: random.Random) -> str:
+    """Generate email from first and last name."""
+    first, last = first.lower(), last.lower()
+    domain = rng.choice(EMAIL_DOMAINS)
 
-    formats = [
-        f"{parts[0]}.{parts[1]}@{domain}",
-        f"{parts[0][0]}{parts[1]}@{domain}",
-        f"{parts[0]}_{parts[1]}@{domain}",
-    ]
-    return rng.choice(formats)
+    # Pick the format first so only the chosen address is built
+    fmt = rng.randrange(3)
+    if fmt == 0:
+        return f"{first}.{last}@{domain}"
+    if fmt == 1:
+        return f"{first[0]}{last}@{domain}"
+    return f"{first}_{last}@{domain}"
 
 
 def generate_users(n: int, seed: int = 42) -> List[Dict[str, Any]]:
@@ -133,21 +134,21 @@ def generate_users(n: int, seed: int = 42) -> List[Dict[str, Any]]:
     Fields: id, name, email, role, active
     """
     rng = random.Random(seed)
-    users = []
-
-    for i in range(1, n + 1):
-        name = generate_name(rng)
-        users.append(
-            {
-                "id": i,
-                "name": name,
-                "email": generate_email(name, rng),
-                "role": rng.choice(ROLES),
-                "active": rng.choice([True, False]),
-            }
-        )
 
-    return users
+    # Sample each column in a single call, then assemble the records
+    firsts = rng.choices(FIRST_NAMES, k=n)
+    lasts = rng.choices(LAST_NAMES, k=n)
+    roles = rng.choices(ROLES, k=n)
+    actives = [rng.random() < 0.5 for _ in range(n)]
+    names = [f"{first} {last}" for first, last in zip(firsts, lasts)]
+    emails = [generate_email(first, last, rng) for first, last in zip(firsts, lasts)]
+
+    return [
+        {"id": i, "name": name, "email": email, "role": role, "active": active}
+        for i, name, email, role, active in zip(
+            range(1, n + 1), names, emails, roles, actives
+        )
+    ]
 
 
 def generate_products(n: int, seed: int = 42) -> List[Dict[str, Any]]:
@@ -157,34 +158,36 @@ def generate_products(n: int, seed: int = 42) -> List[Dict[str, Any]]:
     Fields: id, name, category, price, stock
     """
     rng = random.Random(seed)
-    products = []
-
-    for i in range(1, n + 1):
-        adj = rng.choice(PRODUCT_ADJECTIVES)
-        noun = rng.choice(PRODUCT_NOUNS)
-        name = f"{adj} {noun} {rng.randint(100, 999)}"
-
-        products.append(
-            {
-                "id": i,
-                "name": name,
-                "category": rng.choice(CATEGORIES),
-                "price": round(rng.uniform(9.99, 999.99), 2),
-                "stock": rng.randint(0, 500),
-            }
-        )
 
-    return products
+    # Sample each column in a single call, then assemble the records
+    adjs = rng.choices(PRODUCT_ADJECTIVES, k=n)
+    nouns = rng.choices(PRODUCT_NOUNS, k=n)
+    numbers = rng.choices(range(100, 1000), k=n)
+    categories = rng.choices(CATEGORIES, k=n)
+    prices = [round(rng.uniform(9.99, 999.99), 2) for _ in range(n)]
+    stocks = rng.choices(range(501), k=n)
+
+    return [
+        {
+            "id": i,
+            "name": f"{adj} {noun} {number}",
+            "category": category,
+            "price": price,
+            "stock": stock,
+        }
+        for i, adj, noun, number, category, price, stock in zip(
+            range(1, n + 1), adjs, nouns, numbers, categories, prices, stocks
+        )
+    ]
 
 
 def generate_edge_case_data(seed: int = 42) -> Dict[str, List[Dict]]:
     """
     Generate edge case datasets for robustness testing.
 
-    Returns dict with different edge case categories.
+    Returns dict with different edge case categories. The datasets are
+    fixed; `seed` is unused and kept only for API compatibility.
     """
-    rng = random.Random(seed)
-
     # 1. Strings with delimiter characters
     delimiter_strings = [
         {"id": 1, "name": "O'Brien, James", "note": "Has comma, and apostrophe"},
@@ -247,14 +250,13 @@ def generate_simple_users(n: int, seed: int = 42) -> List[Dict[str, Any]]:
     Fields: id, name, role (3 fields, simpler than full users)
     """
     rng = random.Random(seed)
-    users = []
-
-    for i in range(1, n + 1):
-        users.append(
-            {"id": i, "name": rng.choice(FIRST_NAMES), "role": rng.choice(ROLES)}
-        )
+    names = rng.choices(FIRST_NAMES, k=n)
+    roles = rng.choices(ROLES, k=n)
 
-    return users
+    return [
+        {"id": i, "name": name, "role": role}
+        for i, name, role in zip(range(1, n + 1), names, roles)
+    ]
 
 
 if __name__ == "__main__":
@@ -10,11 +10,15 @@ Test Design:
 - Measurement: tiktoken with cl100k_base encoding
 """
 
-import json
+import functools
+import orjson
+import os
+import numpy as np
 import yaml
 import tiktoken
 import sys
 from pathlib import Path
+from typing import List
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -22,21 +26,52 @@ sys.path.insert(0, str(Path(__file__).parent))
 from data_generators import generate_users
 from toon_encoder import encode as toon_encode
 
+# libyaml's C emitter when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeDumper as YamlDumper
+
+
+@functools.lru_cache(maxsize=8)
+def _get_encoder(model: str) -> tiktoken.Encoding:
+    """Load the tiktoken encoder for a model once and reuse it."""
+    return tiktoken.encoding_for_model(model)
+
 
 def count_tokens(text: str, model: str = "gpt-4") -> int:
     """Count tokens using tiktoken."""
-    encoder = tiktoken.encoding_for_model(model)
-    return len(encoder.encode(text))
+    return len(_get_encoder(model).encode(text))
+
+
+def count_tokens_batch(texts: List[str], model: str = "gpt-4") -> List[int]:
+    """Count tokens for several texts in one batched (multi-threaded) call."""
+    encoded = _get_encoder(model).encode_ordinary_batch(
+        texts, num_threads=os.cpu_count() or 1
+    )
+    return [len(tokens) for tokens in encoded]
+
+
+def measure_exact(texts: List[str]) -> List[int]:
+    """Exact token counts (tiktoken BPE)."""
+    return count_tokens_batch(texts)
+
+
+def measure_proxy(texts: List[str]) -> List[int]:
+    """Character counts, a cheap stand-in for token counts when only trends matter."""
+    return np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)).tolist()
 
 
 def serialize_json(data: list) -> str:
     """Serialize to formatted JSON (standard formatting)."""
-    return json.dumps(data, indent=2)
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
 
 
 def serialize_yaml(data: list) -> str:
     """Serialize to YAML."""
-    return yaml.dump(data, default_flow_style=False, allow_unicode=True)
+    return yaml.dump(
+        data, Dumper=YamlDumper, default_flow_style=False, allow_unicode=True
+    )
 
 
 def serialize_toon(data: list) -> str:
@@ -44,16 +79,8 @@ def serialize_toon(data: list) -> str:
     return toon_encode(data)
 
 
-def run_experiment():
-    """Run the token consumption experiment."""
-    dataset_sizes = [10, 50, 100, 250, 500]
-    results = []
-
-    print("=" * 70)
-    print("EXPERIMENT 1: Token Consumption at Scale")
-    print("=" * 70)
-    print()
-
+def iter_results(dataset_sizes: List[int], measure, unit: str):
+    """Measure each dataset size in turn, yielding one result row per size."""
     for n in dataset_sizes:
         # Generate consistent data
         data = generate_users(n, seed=42)
@@ -67,31 +94,52 @@ def run_experiment():
         toon_str = f"users{toon_encode(data)}"  # Add the 'users' prefix
 
         # Count tokens
-        json_tokens = count_tokens(json_str)
-        yaml_tokens = count_tokens(yaml_str)
-        toon_tokens = count_tokens(toon_str)
+        json_tokens, yaml_tokens, toon_tokens = measure([json_str, yaml_str, toon_str])
 
         # Calculate savings
         toon_savings_vs_json = ((json_tokens - toon_tokens) / json_tokens) * 100
         yaml_savings_vs_json = ((json_tokens - yaml_tokens) / json_tokens) * 100
 
-        results.append(
-            {
-                "records": n,
-                "json_tokens": json_tokens,
-                "yaml_tokens": yaml_tokens,
-                "toon_tokens": toon_tokens,
-                "toon_savings": toon_savings_vs_json,
-                "yaml_savings": yaml_savings_vs_json,
-            }
-        )
+        row = {
+            "records": n,
+            "json_tokens": json_tokens,
+            "yaml_tokens": yaml_tokens,
+            "toon_tokens": toon_tokens,
+            "toon_savings": toon_savings_vs_json,
+            "yaml_savings": yaml_savings_vs_json,
+        }
 
         print(f"Records: {n}")
-        print(f"  JSON:  {json_tokens:,} tokens")
-        print(f"  YAML:  {yaml_tokens:,} tokens ({yaml_savings_vs_json:.1f}% savings)")
-        print(f"  TOON:  {toon_tokens:,} tokens ({toon_savings_vs_json:.1f}% savings)")
+        print(f"  JSON:  {json_tokens:,} {unit}")
+        print(f"  YAML:  {yaml_tokens:,} {unit} ({yaml_savings_vs_json:.1f}% savings)")
+        print(f"  TOON:  {toon_tokens:,} {unit} ({toon_savings_vs_json:.1f}% savings)")
         print()
 
+        # Drop this size's strings before the next, larger size is built
+        del json_str, yaml_str, toon_str
+        yield row
+
+
+def run_experiment(proxy: bool = False):
+    """Run the token consumption experiment.
+
+    With proxy=True, sizes are measured in characters instead of tokens
+    (see measure_proxy) and results are not saved for the graphs.
+    """
+    dataset_sizes = [10, 50, 100, 250, 500]
+    measure = measure_proxy if proxy else measure_exact
+    unit = "chars" if proxy else "tokens"
+
+    print("=" * 70)
+    print("EXPERIMENT 1: Token Consumption at Scale")
+    print("=" * 70)
+    print()
+    if proxy:
+        print("Proxy mode: counting characters, not tokens")
+        print()
+
+    results = list(iter_results(dataset_sizes, measure, unit))
+
     # Print summary table
     print("-" * 70)
     print("SUMMARY TABLE (for article)")
@@ -126,6 +174,9 @@ def run_experiment():
     print("\n=== TOON Format ===")
     print(f"users{toon_encode(example_data)}")
 
+    if proxy:
+        return results
+
     # Save results for graph generation
     import pickle
 
@@ -141,4 +192,14 @@ def run_experiment():
 
 
 if __name__ == "__main__":
-    run_experiment()
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--proxy",
+        action="store_true",
+        help="count characters instead of tokens (fast, results not saved)",
+    )
+    args = parser.parse_args()
+
+    run_experiment(proxy=args.proxy)
@@ -5,18 +5,33 @@ Redesigned to properly test format differences with:
 - Smaller dataset (20 products) for more reliable responses
 - Query types that differentiate formats
 - Better evaluation methodology
+
+Trials repeat byte-identical prompts at temperature 0, so they measure the
+model's run-to-run nondeterminism. --unique-samples K sends only K of them
+per query and replays each reply to the remaining trials. That cuts the
+requests by a factor of trials/K, at the cost of seeing only K distinct
+answers per query. Replayed trials have latency None.
+
+By default all queries of a trial are asked in one batched request. Its
+latency is recorded on the first query only, so per-format latency
+statistics count each request once.
 """
 
-import json
+import asyncio
+import functools
+import gzip
+import orjson
 import time
-import pickle
 import os
+import re
 import sys
 from pathlib import Path
-from typing import Dict, List, Any
-from dataclasses import dataclass
-from statistics import mean, stdev
-from collections import defaultdict
+from typing import Dict, FrozenSet, List, Any, Optional, Tuple
+from dataclasses import asdict, dataclass
+from statistics import fmean
+from collections import Counter, defaultdict
+
+import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -25,45 +40,153 @@ from dotenv import load_dotenv
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
 
+from api_retry import TRANSIENT_ERRORS, retry_transient
+from checkpoint import Checkpoint
 from data_generators import generate_products
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
 from toon_encoder import encode as toon_encode
 
-from openai import OpenAI
+import httpx
+import tiktoken
+from openai import AsyncOpenAI
 
 api_key = os.environ.get("API_KEY")
 if not api_key:
     raise ValueError(f"API_KEY not found in {env_path}")
-client = OpenAI(api_key=api_key)
+
+
+MODEL = "gpt-4o-mini"
+TEMPERATURE = 0
+MAX_RESPONSE_TOKENS = 100
+
+# Sent first in every request, so all trials share the same prompt prefix
+# (system message, then the user message's data block) for OpenAI's
+# server-side prompt caching
+SYSTEM_PROMPT = (
+    "You are a data extraction assistant. "
+    "Respond with only the requested value, no prose."
+)
+
+# Default maximum number of API requests in flight at once
+MAX_CONCURRENT_REQUESTS = 20
+
+# Seconds between status checks of a --batch-api job
+BATCH_POLL_INTERVAL = 30
+
+# Keeps requests under the account's per-minute request and token limits
+rate_limiter = RateLimiter()
+
+# Match types in summary order; evaluate_match returns one of these
+MATCH_TYPES = ("exact", "partial", "failure")
+MATCH_CODES = {match_type: code for code, match_type in enumerate(MATCH_TYPES)}
+
+# Numbers pulled out of model responses by parse_response
+FLOAT_RE = re.compile(r"[\d.]+")
+INT_RE = re.compile(r"\d+")
+
+# "N: answer" lines in replies to build_batched_prompt
+BATCH_ANSWER_RE = re.compile(r"^\s*(\d+)\s*[:.)]\s*(.*?)\s*$", re.MULTILINE)
+
+# Common answer prefixes, stripped in this order (each at most once)
+PREFIX_RE = re.compile(
+    r"(?:The )?(?:the )?(?:It is )?(?:it is )?(?:Product: )?(?:Name: )?(?:Category: )?"
+)
 
 
 @dataclass
 class TrialResult:
     format_type: str
     query_type: str
+    trial: int
     expected: Any
     actual: Any
     match_type: str
-    latency: float
+    latency: Optional[float]  # None for Batch API trials
     raw_response: str
 
 
 def serialize_json(data: list) -> str:
-    return json.dumps({"products": data}, indent=2)
+    return orjson.dumps({"products": data}, option=orjson.OPT_INDENT_2).decode()
 
 
 def serialize_toon(data: list) -> str:
     return f"products{toon_encode(data)}"
 
 
+@dataclass
+class ProductIndex:
+    """Lookup tables over a product list, built in one pass per experiment."""
+
+    products: List[Dict]
+    by_id: Dict[Any, Dict]
+    by_name: Dict[str, Dict]
+    category_counts: Counter
+    cheapest_by_category: Dict[str, Dict]
+
+    @classmethod
+    def build(cls, products: List[Dict]) -> "ProductIndex":
+        by_id = {}
+        by_name = {}
+        category_counts = Counter()
+        cheapest_by_category = {}
+        for p in products:
+            # setdefault keeps the first product on duplicate keys, matching
+            # a front-to-back scan of the list
+            by_id.setdefault(p["id"], p)
+            by_name.setdefault(p["name"], p)
+            category = p["category"]
+            category_counts[category] += 1
+            # Strictly cheaper only, so the first of equal prices wins (as with min())
+            cheapest = cheapest_by_category.get(category)
+            if cheapest is None or p["price"] < cheapest["price"]:
+                cheapest_by_category[category] = p
+        return cls(products, by_id, by_name, category_counts, cheapest_by_category)
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """A query's expected answer, normalized once for evaluate_match.
+
+    Only the fields used by the query type's comparison are set.
+    """
+
+    query_type: str
+    expected: Any
+    expected_float: Optional[float] = None
+    expected_int: Optional[int] = None
+    expected_str: str = ""
+    expected_words: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def build(cls, query_type: str, expected: Any) -> "QueryPlan":
+        if query_type == "price_lookup":
+            try:
+                return cls(query_type, expected, expected_float=float(expected))
+            except (TypeError, ValueError):
+                return cls(query_type, expected)
+        if query_type == "stock_check":
+            try:
+                return cls(query_type, expected, expected_int=int(expected))
+            except (TypeError, ValueError):
+                return cls(query_type, expected)
+        expected_str = str(expected).lower().strip()
+        return cls(
+            query_type,
+            expected,
+            expected_str=expected_str,
+            expected_words=frozenset(expected_str.split()),
+        )
+
+
 def compute_ground_truth(
-    products: List[Dict], query_type: str, query_params: Dict
+    index: ProductIndex, query_type: str, query_params: Dict
 ) -> Any:
+    products = index.products
+
     if query_type == "price_lookup":
-        target_id = query_params["id"]
-        for p in products:
-            if p["id"] == target_id:
-                return p["price"]
-        return None
+        p = index.by_id.get(query_params["id"])
+        return p["price"] if p else None
 
     elif query_type == "product_by_index":
         # What is the Nth product's name?
@@ -74,33 +197,23 @@ def compute_ground_truth(
 
     elif query_type == "category_of_product":
         # What category is product ID X in?
-        target_id = query_params["id"]
-        for p in products:
-            if p["id"] == target_id:
-                return p["category"]
-        return None
+        p = index.by_id.get(query_params["id"])
+        return p["category"] if p else None
 
     elif query_type == "stock_check":
         # What is the stock of product with name X?
-        target_name = query_params["name"]
-        for p in products:
-            if p["name"] == target_name:
-                return p["stock"]
-        return None
+        p = index.by_name.get(query_params["name"])
+        return p["stock"] if p else None
 
     elif query_type == "find_cheapest":
         # What is the cheapest product in category X?
-        target_cat = query_params["category"]
-        cat_products = [p for p in products if p["category"] == target_cat]
-        if cat_products:
-            cheapest = min(cat_products, key=lambda p: p["price"])
-            return cheapest["name"]
-        return None
+        cheapest = index.cheapest_by_category.get(query_params["category"])
+        return cheapest["name"] if cheapest else None
 
     return None
 
 
-def build_prompt(data_str: str, query_type: str, query_params: Dict) -> str:
+def build_question(query_type: str, query_params: Dict) -> str:
     if query_type == "price_lookup":
         question = f"What is the price of the product with ID {query_params['id']}? Reply with just the number."
     elif query_type == "product_by_index":
@@ -113,7 +226,14 @@ def build_prompt(data_str: str, query_type: str, query_params: Dict) -> str:
         question = f"Which product in the {query_params['category']} category has the lowest price? Reply with just the product name."
     else:
         raise ValueError(f"Unknown query type: {query_type}")
+    return question
+
+
+def build_prompt(data_str: str, query_type: str, query_params: Dict) -> str:
+    question = build_question(query_type, query_params)
 
+    # The data comes before the question so that every query against the
+    # same format shares one (cacheable) prompt prefix
     return f"""Here is product data:
 
 {data_str}
@@ -121,22 +241,34 @@ def build_prompt(data_str: str, query_type: str, query_params: Dict) -> str:
 Question: {question}"""
 
 
+def build_batched_prompt(data_str: str, queries: List[Dict]) -> str:
+    """Prompt asking all queries at once; answers come back as "N: value" lines."""
+    questions = "\n".join(
+        f"{number}. {build_question(query['type'], query['params'])}"
+        for number, query in enumerate(queries, start=1)
+    )
+
+    return f"""Here is product data:
+
+{data_str}
+
+Answer each question on its own line, starting with the question number (e.g. "1: 42").
+
+{questions}"""
+
+
 def parse_response(response: str, query_type: str) -> Any:
     response = response.strip().strip("\"'")
 
     if query_type in ["price_lookup"]:
-        import re
-
         cleaned = response.replace("$", "").replace(",", "")
-        match = re.search(r"[\d.]+", cleaned)
+        match = FLOAT_RE.search(cleaned)
         if match:
             return float(match.group())
         return None
 
     elif query_type in ["stock_check"]:
-        import re
-
-        match = re.search(r"\d+", response)
+        match = INT_RE.search(response)
         if match:
             return int(match.group())
         return None
@@ -150,48 +282,56 @@ def parse_response(response: str, query_type: str) -> Any:
         # Clean up response
         response = response.strip()
         # Remove common prefixes
-        for prefix in [
-            "The ",
-            "the ",
-            "It is ",
-            "it is ",
-            "Product: ",
-            "Name: ",
-            "Category: ",
-        ]:
-            if response.startswith(prefix):
-                response = response[len(prefix) :]
+        response = response[PREFIX_RE.match(response).end() :]
         return response.strip()
 
     return response
 
 
-def evaluate_match(expected: Any, actual: Any, query_type: str) -> str:
+def parse_batched_response(response: str) -> Dict[int, str]:
+    """Map question numbers to answers; the first line for a number wins."""
+    answers = {}
+    for match in BATCH_ANSWER_RE.finditer(response):
+        answers.setdefault(int(match.group(1)), match.group(2))
+    return answers
+
+
+def evaluate_match(plan: QueryPlan, actual: Any) -> str:
     if actual is None:
         return "failure"
 
-    if query_type == "price_lookup":
+    if plan.query_type == "price_lookup":
+        if plan.expected_float is None:
+            return "failure"
         try:
-            if abs(float(expected) - float(actual)) < 0.01:
-                return "exact"
-            elif abs(float(expected) - float(actual)) < 5.0:
-                return "partial"
-        except:
-            pass
+            diff = abs(plan.expected_float - float(actual))
+        except (TypeError, ValueError):
+            return "failure"
+        if diff < 0.01:
+            return "exact"
+        elif diff < 5.0:
+            return "partial"
         return "failure"
 
-    elif query_type == "stock_check":
+    elif plan.query_type == "stock_check":
+        if plan.expected_int is None:
+            return "failure"
         try:
-            if int(expected) == int(actual):
-                return "exact"
-            elif abs(int(expected) - int(actual)) <= 5:
-                return "partial"
-        except:
-            pass
+            diff = abs(plan.expected_int - int(actual))
+        except (TypeError, ValueError):
+            return "failure"
+        if diff == 0:
+            return "exact"
+        elif diff <= 5:
+            return "partial"
         return "failure"
 
-    elif query_type in ["product_by_index", "category_of_product", "find_cheapest"]:
-        expected_str = str(expected).lower().strip()
+    elif plan.query_type in [
+        "product_by_index",
+        "category_of_product",
+        "find_cheapest",
+    ]:
+        expected_str = plan.expected_str
         actual_str = str(actual).lower().strip()
 
         if expected_str == actual_str:
@@ -200,10 +340,10 @@ def evaluate_match(expected: Any, actual: Any, query_type: str) -> str:
         if expected_str in actual_str or actual_str in expected_str:
             return "partial"
         # Check for close match (e.g., with/without extra words)
-        expected_words = set(expected_str.split())
-        actual_words = set(actual_str.split())
-        if expected_words & actual_words:  # Some overlap
-            overlap = len(expected_words & actual_words) / len(expected_words)
+        expected_words = plan.expected_words
+        common_words = expected_words.intersection(actual_str.split())
+        if common_words:  # Some overlap
+            overlap = len(common_words) / len(expected_words)
             if overlap >= 0.5:
                 return "partial"
         return "failure"
@@ -211,43 +351,115 @@ def evaluate_match(expected: Any, actual: Any, query_type: str) -> str:
     return "failure"
 
 
-def run_trial(
-    data_str: str,
-    format_type: str,
-    query_type: str,
-    query_params: Dict,
-    expected: Any,
-    verbose: bool = False,
-) -> TrialResult:
-    prompt = build_prompt(data_str, query_type, query_params)
+@functools.lru_cache(maxsize=64)
+def estimate_request_tokens(prompt: str) -> int:
+    """Tokens a request counts against the rate limit: prompt plus max reply."""
+    encoder = tiktoken.encoding_for_model(MODEL)
+    prompt_tokens = len(encoder.encode(SYSTEM_PROMPT)) + len(encoder.encode(prompt))
+    return prompt_tokens + MAX_RESPONSE_TOKENS
+
+
+def request_body(prompt: str) -> Dict:
+    """Chat completion parameters, shared by live and Batch API requests."""
+    return {
+        "model": MODEL,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": TEMPERATURE,
+        "max_tokens": MAX_RESPONSE_TOKENS,
+    }
+
+
+def create_client() -> AsyncOpenAI:
+    """API client for one event loop; use it as `async with create_client()`.
+
+    All requests of a run share one pooled HTTP/2 client, so concurrent
+    requests are multiplexed over a few kept-alive connections instead of
+    each paying for its own TCP and TLS handshake. The pool is bound to
+    the event loop it was used in, so each asyncio.run() needs its own.
+    """
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        timeout=httpx.Timeout(30.0),
+    )
+    return AsyncOpenAI(api_key=api_key, http_client=http_client)
+
 
+@retry_transient
+async def create_completion(client: AsyncOpenAI, prompt: str) -> Tuple[str, float]:
+    """Send one chat request within the rate limits.
+
+    Returns the reply text and the latency of the attempt that succeeded.
+    """
+    await rate_limiter.acquire_async(estimate_request_tokens(prompt))
     start_time = time.time()
+    # Only the reply text is used, so read it straight from the JSON body
+    # rather than validating the whole response into pydantic models
+    raw = await client.chat.completions.with_raw_response.create(**request_body(prompt))
+    latency = time.time() - start_time
+    body = orjson.loads(raw.http_response.content)
+    return body["choices"][0]["message"]["content"] or "", latency
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0,
-            max_tokens=100,
+
+async def fetch_response(
+    client: AsyncOpenAI, prompt: str, cache: Optional[ResponseCache] = None
+) -> Tuple[str, float]:
+    """Reply text and latency for a prompt, from the cache or the API."""
+    start_time = time.time()
+
+    if cache is not None:
+        cache_key = ResponseCache.key(
+            MODEL, prompt, TEMPERATURE, MAX_RESPONSE_TOKENS, system=SYSTEM_PROMPT
         )
-        raw_response = response.choices[0].message.content
+        raw_response = cache.get(cache_key)
+        if raw_response is not None:
+            # Served from the development cache, no request made
+            return raw_response, 0.0
+
+    try:
+        raw_response, latency = await create_completion(client, prompt)
+    except TRANSIENT_ERRORS:
+        # Retries are exhausted; this is not a model failure, so stop the run
+        # (completed trials are checkpointed and a re-run resumes from them)
+        raise
     except Exception as e:
-        raw_response = f"ERROR: {str(e)}"
+        # Permanent errors (e.g. a rejected request) count as failures
+        return f"ERROR: {str(e)}", time.time() - start_time
 
-    latency = time.time() - start_time
+    if cache is not None:
+        cache.set(cache_key, raw_response)
+    return raw_response, latency
 
-    actual = parse_response(raw_response, query_type)
-    match_type = evaluate_match(expected, actual, query_type)
+
+def score_trial(
+    format_type: str,
+    plan: QueryPlan,
+    trial: int,
+    answer: Optional[str],
+    raw_response: str,
+    latency: Optional[float],
+    verbose: bool = False,
+) -> TrialResult:
+    """Parse and grade one answer (None if the model gave no answer)."""
+    if answer is not None:
+        actual = parse_response(answer, plan.query_type)
+    else:
+        actual = None
+    match_type = evaluate_match(plan, actual)
 
     if verbose and match_type == "failure":
         print(
-            f"\n    FAILURE: Expected='{expected}', Got='{actual}', Raw='{raw_response[:80]}'"
+            f"\n    FAILURE: Expected='{plan.expected}', Got='{actual}', Raw='{raw_response[:80]}'"
         )
 
     return TrialResult(
         format_type=format_type,
-        query_type=query_type,
-        expected=expected,
+        query_type=plan.query_type,
+        trial=trial,
+        expected=plan.expected,
         actual=actual,
         match_type=match_type,
         latency=latency,
@@ -255,8 +467,251 @@ def run_trial(
     )
 
 
+def score_request(
+    trials: List[Dict], raw_response: str, latency: Optional[float]
+) -> List[TrialResult]:
+    """Grade every trial answered by one reply.
+
+    Trials asked through a batched prompt carry their "question" number and
+    are graded on that numbered answer, other trials on the whole reply.
+    The request's latency is recorded once, on the first question of the
+    lowest trial number, so each measurement is counted once. The other
+    trials are further questions of the same batched request or replays of
+    the same reply (see --unique-samples) and get None.
+    """
+    answers = parse_batched_response(raw_response) if "question" in trials[0] else None
+    timed = min(
+        range(len(trials)),
+        key=lambda pos: (trials[pos]["trial"], trials[pos].get("question", 0)),
+    )
+    return [
+        score_trial(
+            format_type=trial["format_type"],
+            plan=trial["plan"],
+            trial=trial["trial"],
+            answer=raw_response if answers is None else answers.get(trial["question"]),
+            raw_response=raw_response,
+            latency=latency if pos == timed else None,
+            verbose=trial["verbose"],
+        )
+        for pos, trial in enumerate(trials)
+    ]
+
+
+async def warm_up_connection(client: AsyncOpenAI) -> None:
+    """Open the connection before the timed trials with a 1-token request.
+
+    The first requests otherwise pay for DNS and TLS setup, which inflates
+    their measured latency. The client speaks HTTP/2, so all trials are
+    multiplexed over this one connection and a single request warms it.
+    The reply is discarded, and so is any error (a real problem will show
+    up in the trials).
+    """
+    await rate_limiter.acquire_async(2)
+    try:
+        await client.chat.completions.create(
+            model=MODEL,
+            messages=[{"role": "user", "content": "ping"}],
+            max_tokens=1,
+        )
+    except Exception:
+        pass
+
+
+def group_requests(
+    trials: List[Dict], batch: bool, unique_samples: Optional[int] = None
+) -> List[List[int]]:
+    """Positions in `trials` answered by each request.
+
+    With `batch`, one request answers all queries of a format and trial
+    number; otherwise each (format, query, trial) gets its own. With
+    `unique_samples`, trial numbers are taken modulo it, so each bucket
+    sends only that many distinct requests and replays their replies.
+    """
+    groups = defaultdict(list)
+    for pos, trial in enumerate(trials):
+        sample = trial["trial"] % unique_samples if unique_samples else trial["trial"]
+        if batch:
+            key = (trial["format_type"], sample)
+        else:
+            key = (trial["format_type"], trial["plan"].query_type, sample)
+        groups[key].append(pos)
+    return list(groups.values())
+
+
+async def run_trials(
+    client: AsyncOpenAI,
+    trials: List[Dict],
+    checkpoint: Checkpoint,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    cache: Optional[ResponseCache] = None,
+    batch: bool = False,
+    unique_samples: Optional[int] = None,
+) -> List[TrialResult]:
+    """Run trials concurrently, at most `max_concurrency` requests at a time.
+
+    Trials are grouped into requests by group_requests() and graded by
+    score_request(). Results are returned in the same order as `trials`,
+    and each one is appended to `checkpoint` as soon as it completes.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results: List[Optional[TrialResult]] = [None] * len(trials)
+    requests = group_requests(trials, batch, unique_samples)
+
+    async def bounded_request(positions: List[int]) -> None:
+        request_trials = [trials[pos] for pos in positions]
+        async with semaphore:
+            raw_response, latency = await fetch_response(
+                client, request_trials[0]["prompt"], cache
+            )
+        request_results = score_request(request_trials, raw_response, latency)
+        for pos, result in zip(positions, request_results):
+            results[pos] = result
+            checkpoint.append(asdict(result))
+
+    await asyncio.gather(*(bounded_request(positions) for positions in requests))
+    return results
+
+
+def request_custom_id(trial: Dict, batch: bool) -> str:
+    """Batch API custom_id of the request that answers `trial`."""
+    if batch:
+        return f"{trial['format_type']}-{trial['trial']}"
+    return f"{trial['format_type']}-{trial['plan'].query_type}-{trial['trial']}"
+
+
+async def run_trials_batch_api(
+    client: AsyncOpenAI,
+    trials: List[Dict],
+    checkpoint: Checkpoint,
+    cache: Optional[ResponseCache] = None,
+    batch: bool = False,
+    unique_samples: Optional[int] = None,
+    poll_interval: float = BATCH_POLL_INTERVAL,
+) -> List[TrialResult]:
+    """Run trials as one OpenAI Batch API job instead of live requests.
+
+    Batch jobs cost half as much but can take up to 24 hours, and hide
+    per-request latency, so every result has latency=None. Requests are
+    grouped as in run_trials; replies already in `cache` are not submitted.
+    """
+    requests = group_requests(trials, batch, unique_samples)
+    custom_ids = [
+        request_custom_id(trials[positions[0]], batch) for positions in requests
+    ]
+    replies: Dict[str, str] = {}
+    cache_keys: Dict[str, str] = {}
+    lines = []
+
+    for positions, custom_id in zip(requests, custom_ids):
+        first = trials[positions[0]]
+        if cache is not None:
+            cache_keys[custom_id] = ResponseCache.key(
+                MODEL,
+                first["prompt"],
+                TEMPERATURE,
+                MAX_RESPONSE_TOKENS,
+                system=SYSTEM_PROMPT,
+            )
+            reply = cache.get(cache_keys[custom_id])
+            if reply is not None:
+                replies[custom_id] = reply
+                continue
+        lines.append(
+            orjson.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": request_body(first["prompt"]),
+                }
+            )
+        )
+
+    if lines:
+        batch_file = await client.files.create(
+            file=("exp2_batch.jsonl", b"\n".join(lines)), purpose="batch"
+        )
+        job = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        print(f"Submitted batch {job.id} ({len(lines)} requests), polling...")
+
+        while job.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            job = await client.batches.retrieve(job.id)
+        if job.status != "completed":
+            raise RuntimeError(f"Batch {job.id} ended with status '{job.status}'")
+
+        # Requests that failed outright are listed in the error file instead
+        if job.output_file_id is not None:
+            output = await client.files.content(job.output_file_id)
+            for line in output.text.splitlines():
+                record = orjson.loads(line)
+                custom_id = record["custom_id"]
+                body = record["response"]["body"]
+                if record["response"]["status_code"] == 200:
+                    replies[custom_id] = body["choices"][0]["message"]["content"]
+                    if cache is not None:
+                        cache.set(cache_keys[custom_id], replies[custom_id])
+                else:
+                    replies[custom_id] = f"ERROR: {body['error']['message']}"
+
+    results: List[Optional[TrialResult]] = [None] * len(trials)
+    for positions, custom_id in zip(requests, custom_ids):
+        raw_response = replies.get(custom_id, "ERROR: missing from batch output")
+        request_trials = [trials[pos] for pos in positions]
+        request_results = score_request(request_trials, raw_response, None)
+        for pos, result in zip(positions, request_results):
+            results[pos] = result
+            checkpoint.append(asdict(result))
+
+    return results
+
+
+def summarize_format(match_types: List[str], latencies: List[float]) -> Dict:
+    """Match rates and latency statistics for one format's trials.
+
+    Match types are encoded as small integer codes and counted with
+    np.bincount, so the summary stays cheap for large trial counts.
+    """
+    total = len(match_types)
+    codes = np.fromiter(
+        (MATCH_CODES[m] for m in match_types), dtype=np.uint8, count=total
+    )
+    exact_count, partial_count, failure_count = np.bincount(
+        codes, minlength=len(MATCH_TYPES)
+    ).tolist()
+    # Batch API trials have no latency; with none at all the stats are None
+    latencies = [latency for latency in latencies if latency is not None]
+    if latencies:
+        latency_array = np.asarray(latencies, dtype=np.float64)
+        avg_latency = float(latency_array.mean())
+        std_latency = float(latency_array.std(ddof=1)) if len(latencies) > 1 else 0
+    else:
+        avg_latency = std_latency = None
+
+    return {
+        "exact_rate": 100 * exact_count / total,
+        "partial_rate": 100 * partial_count / total,
+        "failure_rate": 100 * failure_count / total,
+        "avg_latency": avg_latency,
+        "std_latency": std_latency,
+        "latencies": latencies,
+    }
+
+
 def run_experiment(
-    n_products: int = 20, trials_per_query: int = 20, verbose: bool = False
+    n_products: int = 20,
+    trials_per_query: int = 20,
+    verbose: bool = False,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    use_cache: bool = False,
+    batch: bool = True,
+    batch_api: bool = False,
+    unique_samples: Optional[int] = None,
 ):
     print("=" * 70)
     print("EXPERIMENT 2 V2: Comprehension Validation")
@@ -273,11 +728,10 @@ def run_experiment(
     print(f"Compression: {100*(1 - len(toon_str)/len(json_str)):.1f}% smaller")
     print()
 
-    # Category distribution
-    from collections import Counter
+    index = ProductIndex.build(products)
 
-    cats = Counter(p["category"] for p in products)
-    target_category = max(cats, key=cats.get)
+    # Most common category (first seen wins ties)
+    target_category = index.category_counts.most_common(1)[0][0]
 
     # Define queries
     queries = [
@@ -311,47 +765,154 @@ def run_experiment(
     # Compute ground truth
     print("Queries:")
     for query in queries:
-        query["expected"] = compute_ground_truth(
-            products, query["type"], query["params"]
-        )
+        query["expected"] = compute_ground_truth(index, query["type"], query["params"])
+        query["plan"] = QueryPlan.build(query["type"], query["expected"])
         print(f"  {query['description']}: {query['expected']}")
     print()
 
-    results: List[TrialResult] = []
     formats = [("JSON", json_str), ("TOON", toon_str)]
 
     total_trials = len(formats) * len(queries) * trials_per_query
     print(
         f"Running {total_trials} trials ({trials_per_query} per query × {len(queries)} queries × 2 formats)..."
     )
+    if batch:
+        print(f"Batched: all {len(queries)} queries per request (--no-batch to split)")
+    if unique_samples and unique_samples < trials_per_query:
+        print(
+            f"Coalesced: {unique_samples} unique requests per query, "
+            f"replayed to {trials_per_query} trials (replays have no latency)"
+        )
     print()
 
+    # The trial count is known up front, so fill a preallocated list
+    trials = [None] * total_trials
+    idx = 0
     for format_name, data_str in formats:
-        print(f"{format_name}:")
-        for query in queries:
-            print(f"  {query['type'][:20]:<20}...", end=" ", flush=True)
-            query_results = []
-
+        if batch:
+            batched_prompt = build_batched_prompt(data_str, queries)
+        for number, query in enumerate(queries, start=1):
+            # Identical for every trial of this (format, query) pair
+            if batch:
+                prompt = batched_prompt
+            else:
+                prompt = build_prompt(data_str, query["type"], query["params"])
             for trial_num in range(trials_per_query):
-                result = run_trial(
-                    data_str=data_str,
-                    format_type=format_name,
-                    query_type=query["type"],
-                    query_params=query["params"],
-                    expected=query["expected"],
-                    verbose=verbose and trial_num == 0,
+                trials[idx] = {
+                    "prompt": prompt,
+                    "format_type": format_name,
+                    "plan": query["plan"],
+                    "trial": trial_num,
+                    "verbose": verbose and trial_num == 0,
+                }
+                if batch:
+                    trials[idx]["question"] = number
+                idx += 1
+
+    # Reuse trials completed by an interrupted run with the same setup. The
+    # checkpoint's first record is that setup; trials from a run with other
+    # settings measure something else, so they are never merged in
+    results_dir = Path(__file__).parent.parent / "graphics-creation"
+    results_path = results_dir / "exp2_results.json.gz"
+    checkpoint = Checkpoint(results_dir / "exp2_results.jsonl")
+    setup = {
+        "model": MODEL,
+        "n_products": n_products,
+        "batch": batch,
+        "batch_api": batch_api,
+        "unique_samples": unique_samples,
+        # Cached replies have latency 0 and must not mix with live ones
+        "cache": use_cache,
+    }
+    if not checkpoint.records:
+        checkpoint.append({"setup": setup})
+    elif checkpoint.records[0].get("setup") != setup:
+        raise ValueError(
+            f"{checkpoint.path} is from a run with different settings "
+            f"({checkpoint.records[0].get('setup', 'unknown')}); re-run with "
+            f"those settings to resume it, or delete it to start over"
+        )
+    completed = {
+        (r["format_type"], r["query_type"], r["trial"], r["expected"]): r
+        for r in checkpoint.records[1:]
+    }
+    results = [None] * total_trials
+    pending = []
+    for idx, trial in enumerate(trials):
+        key = (
+            trial["format_type"],
+            trial["plan"].query_type,
+            trial["trial"],
+            trial["plan"].expected,
+        )
+        if key in completed:
+            results[idx] = TrialResult(**completed[key])
+        else:
+            pending.append(idx)
+    if len(pending) < total_trials:
+        print(
+            f"Resuming: {total_trials - len(pending)} trials loaded from {checkpoint.path}"
+        )
+        print()
+
+    if use_cache:
+        print("Response cache enabled: cached replies are reused with latency 0")
+        print()
+    cache = ResponseCache("exp2") if use_cache else None
+    pending_trials = [trials[idx] for idx in pending]
+
+    async def run_pending() -> List[TrialResult]:
+        # Pooled connections belong to this event loop; they are closed in
+        # it when the block exits
+        async with create_client() as client:
+            if batch_api:
+                return await run_trials_batch_api(
+                    client, pending_trials, checkpoint, cache, batch, unique_samples
                 )
-                results.append(result)
-                query_results.append(result)
-                time.sleep(0.05)
+            # Cached runs are for development and their replies mostly cost
+            # no request, so they skip the billable warm-up request
+            if pending_trials and cache is None:
+                print("Warming up: 1 untimed 1-token request")
+                print()
+                await warm_up_connection(client)
+            return await run_trials(
+                client,
+                pending_trials,
+                checkpoint,
+                max_concurrency,
+                cache,
+                batch,
+                unique_samples,
+            )
 
-            exact = sum(1 for r in query_results if r.match_type == "exact")
-            partial = sum(1 for r in query_results if r.match_type == "partial")
-            failure = sum(1 for r in query_results if r.match_type == "failure")
-            avg_latency = mean(r.latency for r in query_results)
+    try:
+        pending_results = asyncio.run(run_pending())
+    finally:
+        if cache is not None:
+            cache.close()
+    for idx, result in zip(pending, pending_results):
+        results[idx] = result
+
+    # Trials are ordered by format, then query, then trial number
+    offset = 0
+    for format_name, _ in formats:
+        print(f"{format_name}:")
+        for query in queries:
+            print(f"  {query['type'][:20]:<20}...", end=" ")
+            query_results = results[offset : offset + trials_per_query]
+            offset += trials_per_query
+
+            counts = Counter(r.match_type for r in query_results)
+            exact = counts["exact"]
+            partial = counts["partial"]
+            failure = counts["failure"]
+            query_latencies = [
+                r.latency for r in query_results if r.latency is not None
+            ]
+            avg_latency = f"{fmean(query_latencies):.2f}s" if query_latencies else "n/a"
 
             print(
-                f"exact={exact:2d}/{trials_per_query}, partial={partial:2d}, fail={failure:2d} | {avg_latency:.2f}s"
+                f"exact={exact:2d}/{trials_per_query}, partial={partial:2d}, fail={failure:2d} | {avg_latency}"
             )
         print()
 
@@ -360,32 +921,29 @@ def run_experiment(
     print("AGGREGATED RESULTS")
     print("-" * 70)
 
+    # Match types and latencies per format, gathered in one pass
+    format_match_types = defaultdict(list)
+    format_latencies = defaultdict(list)
+    for r in results:
+        format_match_types[r.format_type].append(r.match_type)
+        format_latencies[r.format_type].append(r.latency)
+
     summary = {}
     for format_name in ["JSON", "TOON"]:
-        format_results = [r for r in results if r.format_type == format_name]
-        total = len(format_results)
-
-        exact_count = sum(1 for r in format_results if r.match_type == "exact")
-        partial_count = sum(1 for r in format_results if r.match_type == "partial")
-        failure_count = sum(1 for r in format_results if r.match_type == "failure")
-        latencies = [r.latency for r in format_results]
-
-        summary[format_name] = {
-            "exact_rate": 100 * exact_count / total,
-            "partial_rate": 100 * partial_count / total,
-            "failure_rate": 100 * failure_count / total,
-            "avg_latency": mean(latencies),
-            "std_latency": stdev(latencies) if len(latencies) > 1 else 0,
-            "latencies": latencies,
-        }
+        summary[format_name] = summarize_format(
+            format_match_types[format_name], format_latencies[format_name]
+        )
 
         print(f"\n{format_name}:")
         print(f"  Exact:   {summary[format_name]['exact_rate']:.1f}%")
         print(f"  Partial: {summary[format_name]['partial_rate']:.1f}%")
         print(f"  Failure: {summary[format_name]['failure_rate']:.1f}%")
-        print(
-            f"  Latency: {summary[format_name]['avg_latency']:.2f}s (±{summary[format_name]['std_latency']:.2f}s)"
-        )
+        if summary[format_name]["avg_latency"] is not None:
+            print(
+                f"  Latency: {summary[format_name]['avg_latency']:.2f}s (±{summary[format_name]['std_latency']:.2f}s)"
+            )
+        else:
+            print("  Latency: n/a (Batch API)")
 
     print()
     print("-" * 70)
@@ -400,8 +958,11 @@ def run_experiment(
     )
     for fmt in ["JSON", "TOON"]:
         s = summary[fmt]
+        avg_latency = (
+            f"{s['avg_latency']:.2f}s" if s["avg_latency"] is not None else "n/a"
+        )
         print(
-            f"| {fmt:<6} | {s['exact_rate']:>15.1f}% | {s['partial_rate']:>17.1f}% | {s['failure_rate']:>11.1f}% | {s['avg_latency']:>11.2f}s |"
+            f"| {fmt:<6} | {s['exact_rate']:>15.1f}% | {s['partial_rate']:>17.1f}% | {s['failure_rate']:>11.1f}% | {avg_latency:>12} |"
         )
 
     # Analysis
@@ -413,12 +974,15 @@ def run_experiment(
 
     print(f"TOON vs JSON:")
     print(f"  Accuracy diff: {toon_exact - json_exact:+.1f} percentage points")
-    print(f"  Latency improvement: {100*(json_lat - toon_lat)/json_lat:.1f}%")
+    if json_lat is None or toon_lat is None:
+        print("  Latency improvement: n/a (Batch API)")
+    elif json_lat > 0:
+        print(f"  Latency improvement: {100*(json_lat - toon_lat)/json_lat:.1f}%")
+    else:
+        # Every JSON reply came from the response cache
+        print("  Latency improvement: n/a (cached replies)")
 
     # Save results
-    results_path = (
-        Path(__file__).parent.parent / "graphics-creation" / "exp2_results.pkl"
-    )
     raw_results_dicts = [
         {
             "format_type": r.format_type,
@@ -428,9 +992,11 @@ def run_experiment(
         }
         for r in results
     ]
-    with open(results_path, "wb") as f:
-        pickle.dump({"summary": summary, "raw_results": raw_results_dicts}, f)
+    # gzip level 1 roughly halves the file at close to copy speed
+    with gzip.open(results_path, "wb", compresslevel=1) as f:
+        f.write(orjson.dumps({"summary": summary, "raw_results": raw_results_dicts}))
     print(f"\nResults saved to: {results_path}")
+    checkpoint.remove()
 
     return summary, results
 
@@ -442,8 +1008,46 @@ if __name__ == "__main__":
     parser.add_argument("--products", type=int, default=20)
     parser.add_argument("--trials", type=int, default=20)
     parser.add_argument("--verbose", action="store_true")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=MAX_CONCURRENT_REQUESTS,
+        help="maximum number of API requests in flight at once",
+    )
+    parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="reuse identical API replies from tests/.cache (development only)",
+    )
+    parser.add_argument(
+        "--batch",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="ask all queries in one request per trial (--no-batch: one request per query)",
+    )
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="submit all requests as one OpenAI Batch API job (half price, up to 24h, no latencies)",
+    )
+    parser.add_argument(
+        "--unique-samples",
+        type=int,
+        metavar="K",
+        help="send only K distinct requests per query and replay their replies to the other trials",
+    )
     args = parser.parse_args()
+    if args.unique_samples is not None and args.unique_samples < 1:
+        parser.error("--unique-samples must be at least 1")
 
     run_experiment(
-        n_products=args.products, trials_per_query=args.trials, verbose=args.verbose
+        n_products=args.products,
+        trials_per_query=args.trials,
+        verbose=args.verbose,
+        max_concurrency=args.concurrency,
+        use_cache=args.cache,
+        batch=args.batch,
+        batch_api=args.batch_api,
+        unique_samples=args.unique_samples,
     )
@@ -13,14 +13,14 @@ Test Cases:
 For each: verify round-trip consistency, token efficiency, model comprehension.
 """
 
+import asyncio
 import json
-import time
 import pickle
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Any
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import asdict, dataclass
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -32,15 +32,25 @@ env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
 
 import tiktoken
-from openai import OpenAI
+from openai import AsyncOpenAI
+from api_retry import TRANSIENT_ERRORS, retry_transient
+from checkpoint import Checkpoint
 from data_generators import generate_edge_case_data
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
 from toon_encoder import encode as toon_encode, decode as toon_decode
 
-# Initialize OpenAI client
+# The OpenAI client itself is created per run, in run_test_cases
 api_key = os.environ.get("API_KEY")
 if not api_key:
     raise ValueError(f"API_KEY not found in {env_path}")
-client = OpenAI(api_key=api_key)
+
+MODEL = "gpt-4o-mini"
+TEMPERATURE = 0
+MAX_RESPONSE_TOKENS = 100
+
+# Keeps requests under the account's per-minute request and token limits
+rate_limiter = RateLimiter()
 
 # Token encoder
 encoder = tiktoken.encoding_for_model("gpt-4")
@@ -51,6 +61,39 @@ def count_tokens(text: str) -> int:
     return len(encoder.encode(text))
 
 
+def count_tokens_batch(texts: List[str]) -> List[int]:
+    """Count tokens for several texts in one batched (multi-threaded) call."""
+    encoded = encoder.encode_ordinary_batch(texts, num_threads=os.cpu_count() or 1)
+    return [len(tokens) for tokens in encoded]
+
+
+@retry_transient
+async def create_completion(client: AsyncOpenAI, prompt: str) -> str:
+    """Send a single-message chat request and return the reply text."""
+    await rate_limiter.acquire_async(count_tokens(prompt) + MAX_RESPONSE_TOKENS)
+    response = await client.chat.completions.create(
+        model=MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=TEMPERATURE,
+        max_tokens=MAX_RESPONSE_TOKENS,
+    )
+    return response.choices[0].message.content.strip()
+
+
+async def cached_completion(
+    client: AsyncOpenAI, prompt: str, cache: Optional[ResponseCache]
+) -> str:
+    """create_completion(), served from `cache` when it already has the reply."""
+    if cache is None:
+        return await create_completion(client, prompt)
+    key = ResponseCache.key(MODEL, prompt, TEMPERATURE, MAX_RESPONSE_TOKENS)
+    reply = cache.get(key)
+    if reply is None:
+        reply = await create_completion(client, prompt)
+        cache.set(key, reply)
+    return reply
+
+
 @dataclass
 class EdgeCaseResult:
     """Result for an edge case test."""
@@ -62,12 +105,11 @@ class EdgeCaseResult:
     notes: str
 
 
-def test_round_trip(data: Any) -> tuple[bool, str]:
-    """Test if data survives encode -> decode."""
+def test_round_trip(data: Any, toon_str: str) -> tuple[bool, str]:
+    """Test if data survives encode -> decode (`toon_str` is its encoding)."""
     try:
         if isinstance(data, list) and data and isinstance(data[0], dict):
-            encoded = toon_encode(data)
-            decoded = toon_decode(encoded)
+            decoded = toon_decode(toon_str)
 
             # Compare data
             if len(decoded) != len(data):
@@ -94,20 +136,15 @@ def test_round_trip(data: Any) -> tuple[bool, str]:
 
             return True, "Perfect round-trip"
         else:
-            # For non-tabular data, just verify encode works
-            encoded = toon_encode(data)
+            # For non-tabular data, encoding succeeded (toon_str exists)
             return True, "Encode successful (decode not applicable for nested)"
     except Exception as e:
         return False, f"Error: {str(e)}"
 
 
-def test_token_savings(data: Any) -> float:
+def test_token_savings(json_str: str, toon_str: str) -> float:
     """Calculate token savings of TOON vs JSON."""
-    json_str = json.dumps(data, indent=2, ensure_ascii=False)
-    toon_str = toon_encode(data)
-
-    json_tokens = count_tokens(json_str)
-    toon_tokens = count_tokens(toon_str)
+    json_tokens, toon_tokens = count_tokens_batch([json_str, toon_str])
 
     if json_tokens == 0:
         return 0.0
@@ -115,12 +152,18 @@ def test_token_savings(data: Any) -> float:
     return ((json_tokens - toon_tokens) / json_tokens) * 100
 
 
-def test_comprehension(data: Any, test_name: str) -> tuple[bool, str]:
-    """Test if GPT-4 can correctly extract info from TOON-formatted data."""
+async def test_comprehension(
+    client: AsyncOpenAI,
+    data: Any,
+    toon_str: str,
+    cache: Optional[ResponseCache] = None,
+) -> tuple[bool, str]:
+    """Test if GPT-4 can correctly extract info from TOON-formatted data.
+
+    `toon_str` is the TOON encoding of `data`.
+    """
     try:
         if isinstance(data, list) and data and isinstance(data[0], dict):
-            toon_str = toon_encode(data)
-
             # Create a simple extraction question
             first_item = data[0]
             first_key = list(first_item.keys())[0]
@@ -132,14 +175,7 @@ def test_comprehension(data: Any, test_name: str) -> tuple[bool, str]:
 
 What is the value of '{first_key}' for the first record? Answer with just the value."""
 
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0,
-                max_tokens=100,
-            )
-
-            actual = response.choices[0].message.content.strip()
+            actual = await cached_completion(client, prompt, cache)
 
             # Flexible comparison
             expected_str = str(expected_value).lower().strip()
@@ -154,7 +190,6 @@ What is the value of '{first_key}' for the first record? Answer with just the va
             list(data.values())[0] if data else None, (dict, list)
         ):
             # Flat dict
-            toon_str = toon_encode(data)
             first_key = list(data.keys())[0]
             expected_value = data[first_key]
 
@@ -164,14 +199,7 @@ What is the value of '{first_key}' for the first record? Answer with just the va
 
 What is the value of '{first_key}'? Answer with just the value."""
 
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0,
-                max_tokens=100,
-            )
-
-            actual = response.choices[0].message.content.strip()
+            actual = await cached_completion(client, prompt, cache)
 
             if str(expected_value).lower() in actual.lower():
                 return True, f"Extracted '{actual}'"
@@ -180,22 +208,13 @@ What is the value of '{first_key}'? Answer with just the value."""
 
         else:
             # For deeply nested, test if model can navigate
-            toon_str = toon_encode(data)
-
             prompt = f"""Here is nested data:
 
 {toon_str}
 
 What is the deepest value in this structure? Answer with just the value."""
 
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0,
-                max_tokens=100,
-            )
-
-            actual = response.choices[0].message.content.strip()
+            actual = await cached_completion(client, prompt, cache)
 
             # Check if "deeply nested" appears
             if "nested" in actual.lower() or "deeply" in actual.lower():
@@ -203,12 +222,86 @@ What is the deepest value in this structure? Answer with just the value."""
             else:
                 return False, f"Got: {actual} (may be acceptable)"
 
+    except TRANSIENT_ERRORS:
+        # Out of retries: stop rather than record an API outage as a model
+        # failure (finished test cases are checkpointed)
+        raise
     except Exception as e:
         return False, f"Error: {str(e)}"
 
 
-def run_experiment():
-    """Run the robustness experiment."""
+async def run_test_case(
+    client: AsyncOpenAI,
+    test_id: str,
+    test_name: str,
+    data: Any,
+    checkpoint: Checkpoint,
+    cache: Optional[ResponseCache] = None,
+) -> Tuple[EdgeCaseResult, str]:
+    """Run all tests for one edge case and checkpoint the result.
+
+    Cases run concurrently, so the progress report is returned (as text)
+    along with the result rather than printed.
+    """
+    # Encode once; every test below works from these strings
+    toon_str = toon_encode(data)
+    json_str = json.dumps(data, indent=2, ensure_ascii=False)
+
+    # Show the TOON output
+    report = [f"TOON output ({len(toon_str)} chars):"]
+    if len(toon_str) > 300:
+        report.append(f"  {toon_str[:300]}...")
+    else:
+        report.append(f"  {toon_str}")
+
+    # Test round-trip
+    rt_pass, rt_notes = test_round_trip(data, toon_str)
+    report.append(f"Round-trip: {'✓ PASS' if rt_pass else '✗ FAIL'} - {rt_notes}")
+
+    # Test token savings
+    savings = test_token_savings(json_str, toon_str)
+    report.append(f"Token savings: {savings:.1f}%")
+
+    # Test comprehension
+    comp_pass, comp_notes = await test_comprehension(client, data, toon_str, cache)
+    report.append(
+        f"Comprehension: {'✓ PASS' if comp_pass else '✗ FAIL'} - {comp_notes}"
+    )
+
+    result = EdgeCaseResult(
+        test_case=test_name,
+        round_trip_pass=rt_pass,
+        token_savings=savings,
+        comprehension_pass=comp_pass,
+        notes=f"RT: {rt_notes}; Comp: {comp_notes}",
+    )
+    checkpoint.append({"test_id": test_id, **asdict(result)})
+    return result, "\n".join(report)
+
+
+async def run_test_cases(
+    test_cases: List[Tuple[str, str, Any]],
+    checkpoint: Checkpoint,
+    cache: Optional[ResponseCache] = None,
+) -> List[Tuple[EdgeCaseResult, str]]:
+    """Run the edge cases concurrently; they share nothing but the client."""
+    # The client's connections belong to this event loop; they are closed
+    # in it when the block exits
+    async with AsyncOpenAI(api_key=api_key) as client:
+        return await asyncio.gather(
+            *(
+                run_test_case(client, test_id, test_name, data, checkpoint, cache)
+                for test_id, test_name, data in test_cases
+            )
+        )
+
+
+def run_experiment(use_cache: bool = False):
+    """Run the robustness experiment.
+
+    With use_cache=True, model replies are reused from the development
+    response cache (see response_cache.py).
+    """
     print("=" * 70)
     print("EXPERIMENT 3: Robustness Under Adversarial Conditions")
     print("=" * 70)
@@ -219,6 +312,14 @@ def run_experiment():
 
     results: List[EdgeCaseResult] = []
 
+    results_path = (
+        Path(__file__).parent.parent / "graphics-creation" / "exp3_results.pkl"
+    )
+
+    # Test cases finished by an interrupted run, keyed by test id
+    checkpoint = Checkpoint(results_path.with_suffix(".jsonl"))
+    completed = {r.pop("test_id"): EdgeCaseResult(**r) for r in checkpoint.records}
+
     test_cases = [
         ("delimiter_strings", "Delimiter strings", edge_cases["delimiter_strings"]),
         ("empty_values", "Empty values", edge_cases["empty_values"]),
@@ -227,42 +328,27 @@ def run_experiment():
         ("deep_nested", "Deep nesting (4+ levels)", edge_cases["deep_nested"]),
     ]
 
+    cache = ResponseCache("exp3") if use_cache else None
+    pending = [case for case in test_cases if case[0] not in completed]
+    try:
+        pending_results = asyncio.run(run_test_cases(pending, checkpoint, cache))
+    finally:
+        if cache is not None:
+            cache.close()
+    new_results = {case[0]: r for case, r in zip(pending, pending_results)}
+
     for test_id, test_name, data in test_cases:
         print(f"\nTesting: {test_name}")
         print("-" * 40)
 
-        # Show the TOON output
-        toon_output = toon_encode(data)
-        print(f"TOON output ({len(toon_output)} chars):")
-        if len(toon_output) > 300:
-            print(f"  {toon_output[:300]}...")
-        else:
-            print(f"  {toon_output}")
-
-        # Test round-trip
-        rt_pass, rt_notes = test_round_trip(data)
-        print(f"Round-trip: {'✓ PASS' if rt_pass else '✗ FAIL'} - {rt_notes}")
-
-        # Test token savings
-        savings = test_token_savings(data)
-        print(f"Token savings: {savings:.1f}%")
-
-        # Test comprehension
-        comp_pass, comp_notes = test_comprehension(data, test_name)
-        print(f"Comprehension: {'✓ PASS' if comp_pass else '✗ FAIL'} - {comp_notes}")
-
-        results.append(
-            EdgeCaseResult(
-                test_case=test_name,
-                round_trip_pass=rt_pass,
-                token_savings=savings,
-                comprehension_pass=comp_pass,
-                notes=f"RT: {rt_notes}; Comp: {comp_notes}",
-            )
-        )
+        if test_id in completed:
+            print(f"Loaded from {checkpoint.path}")
+            results.append(completed[test_id])
+            continue
 
-        # Rate limiting
-        time.sleep(0.5)
+        result, report = new_results[test_id]
+        print(report)
+        results.append(result)
 
     # Print summary table
     print()
@@ -298,9 +384,6 @@ def run_experiment():
     print(f"  Average token savings: {avg_savings:.1f}%")
 
     # Save results (convert to plain dicts for pickle compatibility)
-    results_path = (
-        Path(__file__).parent.parent / "graphics-creation" / "exp3_results.pkl"
-    )
     results_dicts = [
         {
             "test_case": r.test_case,
@@ -314,9 +397,21 @@ def run_experiment():
     with open(results_path, "wb") as f:
         pickle.dump(results_dicts, f)
     print(f"\nResults saved to: {results_path}")
+    checkpoint.remove()
 
     return results
 
 
 if __name__ == "__main__":
-    run_experiment()
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="reuse identical API replies from tests/.cache (development only)",
+    )
+    args = parser.parse_args()
+
+    run_experiment(use_cache=args.cache)
@@ -0,0 +1,74 @@
+"""
+Client-side rate limiting for OpenAI API calls.
+
+Follows the openai-cookbook api_request_parallel_processor approach: one
+token bucket for requests per minute and one for tokens per minute. Both
+refill continuously, and a request is released only when both have
+capacity for it.
+"""
+
+import asyncio
+import time
+
+# gpt-4o-mini limits for a tier 1 account; lower these if requests get 429s
+MAX_REQUESTS_PER_MINUTE = 500
+MAX_TOKENS_PER_MINUTE = 200_000
+
+
+class RateLimiter:
+    """Dual token bucket for request and token rate limits."""
+
+    def __init__(
+        self,
+        max_requests_per_minute: float = MAX_REQUESTS_PER_MINUTE,
+        max_tokens_per_minute: float = MAX_TOKENS_PER_MINUTE,
+    ):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_request_capacity = float(max_requests_per_minute)
+        self.available_token_capacity = float(max_tokens_per_minute)
+        self._last_update = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_update
+        self._last_update = now
+        self.available_request_capacity = min(
+            self.available_request_capacity
+            + elapsed * self.max_requests_per_minute / 60,
+            self.max_requests_per_minute,
+        )
+        self.available_token_capacity = min(
+            self.available_token_capacity + elapsed * self.max_tokens_per_minute / 60,
+            self.max_tokens_per_minute,
+        )
+
+    def _reserve(self, tokens: int) -> float:
+        """Take capacity for one request and return 0, or return how many
+        seconds to wait before trying again."""
+        self._refill()
+        # A request larger than the whole bucket waits for a full bucket
+        tokens = min(tokens, self.max_tokens_per_minute)
+        if (
+            self.available_request_capacity >= 1
+            and self.available_token_capacity >= tokens
+        ):
+            self.available_request_capacity -= 1
+            self.available_token_capacity -= tokens
+            return 0.0
+        request_wait = (1 - self.available_request_capacity) * 60
+        token_wait = (tokens - self.available_token_capacity) * 60
+        return max(
+            request_wait / self.max_requests_per_minute,
+            token_wait / self.max_tokens_per_minute,
+        )
+
+    def acquire(self, tokens: int) -> None:
+        """Block until a request using `tokens` tokens may be sent."""
+        while (wait := self._reserve(tokens)) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int) -> None:
+        """Like acquire(), but yields to the event loop while waiting."""
+        while (wait := self._reserve(tokens)) > 0:
+            await asyncio.sleep(wait)
@@ -0,0 +1,51 @@
+"""
+Persistent exact-match cache of API replies, for development runs.
+
+Experiments send each prompt many times with temperature=0 to measure the
+spread of model behavior, so caching defeats the measurement. It is opt-in
+(--cache) and meant for iterating on prompts, parsing and reporting
+without repeating hundreds of API calls.
+"""
+
+import hashlib
+import shelve
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR = Path(__file__).parent / ".cache"
+
+
+class ResponseCache:
+    """Reply texts stored in a shelve database, keyed by request parameters."""
+
+    def __init__(self, name: str):
+        CACHE_DIR.mkdir(exist_ok=True)
+        self._db = shelve.open(str(CACHE_DIR / name))
+
+    @staticmethod
+    def key(
+        model: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: str = "",
+    ) -> str:
+        request = "\0".join([model, system, prompt, str(temperature), str(max_tokens)])
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        return self._db.get(key)
+
+    def set(self, key: str, response: str) -> None:
+        self._db[key] = response
+        # Write through so replies survive an interrupted run
+        self._db.sync()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
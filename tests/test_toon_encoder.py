@@ -0,0 +1,26 @@
+"""
+Unit tests for the TOON encoder/decoder.
+
+Run with: python -m unittest discover tests
+"""
+
+import unittest
+
+from toon_encoder import decode, encode
+
+
+class TestDecodeTabular(unittest.TestCase):
+    def test_space_before_quoted_value(self):
+        text = '[2]{a,b}:\n1, "x,y"\n2,y'
+        self.assertEqual(decode(text), [{"a": 1, "b": "x,y"}, {"a": 2, "b": "y"}])
+
+
+class TestRoundTrip(unittest.TestCase):
+    def test_carriage_return(self):
+        # csv.reader rejects a bare \r outside quotes, so it must be quoted
+        data = [{"a": "x\ry", "b": 1}, {"a": "x\r\ny", "b": 2}]
+        self.assertEqual(decode(encode(data)), data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,55 +11,84 @@ Key features:
 - Graceful degradation: falls back to YAML-like syntax for non-tabular data
 """
 
-from typing import Any, List, Dict, Union
+from typing import Any, Iterator, List, Dict, TextIO, Union
+import csv
+import io
 import re
+from operator import itemgetter
+
+# Tabular header: name[count]{field1,field2,...}:
+HEADER_RE = re.compile(r"(?:(\w+))?\[(\d+)\]\{([^}]*)\}:")
 
 
 def needs_escaping(value: str) -> bool:
     """Check if a string value needs escaping due to delimiter characters."""
-    return "," in value or "\n" in value or '"' in value
+    # \r counts as a line break too: csv.reader rejects it in unquoted values
+    return "," in value or "\n" in value or "\r" in value or '"' in value
 
 
 def escape_value(value: str) -> str:
     """Escape a value that contains delimiter characters."""
-    if needs_escaping(value):
+    # Same check as needs_escaping, inlined: this runs once per string cell
+    if "," in value or "\n" in value or "\r" in value or '"' in value:
         # Use double quotes and escape internal quotes
-        escaped = value.replace('"', '""')
-        return f'"{escaped}"'
+        return '"' + value.replace('"', '""') + '"'
     return value
 
 
+def _format_bool(value: bool) -> str:
+    return "true" if value else "false"
+
+
+def _format_none(value: None) -> str:
+    return ""
+
+
+# Formatter per exact cell type: one dict lookup instead of an isinstance
+# chain. Keyed on type(value), so bool does not fall under int. repr gives
+# the same text as str for int and float and skips str's type dispatch
+_FORMATTERS = {
+    str: escape_value,
+    int: repr,
+    float: repr,
+    bool: _format_bool,
+    type(None): _format_none,
+}
+
+
 def format_value(value: Any) -> str:
     """Format a single value for TOON output."""
-    if value is None:
-        return ""
+    formatter = _FORMATTERS.get(type(value))
+    if formatter is not None:
+        return formatter(value)
+    return _format_other(value)
+
+
+def _format_other(value: Any) -> str:
+    """Format a value whose exact type is not in _FORMATTERS (e.g. subclasses)."""
+    if isinstance(value, str):
+        return escape_value(value)
     if isinstance(value, bool):
-        return "true" if value else "false"
+        return _format_bool(value)
     if isinstance(value, (int, float)):
         return str(value)
-    if isinstance(value, str):
-        return escape_value(value)
     # For complex types, fall back to string representation
     return escape_value(str(value))
 
 
 def is_tabular(data: List[Dict]) -> bool:
     """Check if a list of dicts has uniform schema (suitable for tabular format)."""
-    if not data or not isinstance(data, list):
-        return False
-    if not all(isinstance(item, dict) for item in data):
+    if not data or not isinstance(data, list) or not isinstance(data[0], dict):
         return False
 
-    # Get keys from first item
-    first_keys = set(data[0].keys())
+    # Keys views compare like sets, without building one per item
+    first_keys = data[0].keys()
 
-    # Check if all items have the same keys
-    for item in data[1:]:
-        if set(item.keys()) != first_keys:
-            return False
-
-    # Check that values are primitives (not nested structures)
+    # One pass: every item is a dict with the same keys and primitive values,
+    # stopping at the first item that breaks either rule
     for item in data:
+        if not isinstance(item, dict) or item.keys() != first_keys:
+            return False
         for value in item.values():
             if isinstance(value, (dict, list)):
                 return False
@@ -84,19 +113,52 @@ def encode_tabular(data: List[Dict], name: str = None) -> str:
     else:
         header = f"[{count}]{{{fields}}}:"
 
-    # Build rows
-    rows = []
-    for item in data:
-        row_values = [format_value(item.get(key)) for key in keys]
-        rows.append(",".join(row_values))
+    # Format column by column: when every value in a column has the same
+    # type, its formatter is looked up once and mapped over the column
+    columns = []
+    for key in keys:
+        try:
+            # Gather the column in C; tabular rows all have the same keys
+            values = list(map(itemgetter(key), data))
+        except KeyError:
+            # Called directly on rows with missing keys: treat them as None
+            values = [item.get(key) for item in data]
+        types = set(map(type, values))
+        formatter = format_value
+        if len(types) == 1:
+            formatter = _FORMATTERS.get(types.pop(), format_value)
+        columns.append(map(formatter, values))
+
+    # Build rows (rows of a table without columns are empty lines)
+    if columns:
+        rows = map(",".join, zip(*columns))
+    else:
+        rows = [""] * count
 
     return header + "\n" + "\n".join(rows)
 
 
 def encode_nested(data: Any, indent: int = 0) -> str:
     """Encode nested/non-tabular data in YAML-like format."""
-    prefix = "  " * indent
+    is_structure = isinstance(data, dict) or (
+        isinstance(data, list) and not is_tabular(data)
+    )
+    if is_structure and data:
+        return _encode_structure(data, indent)
+    return _encode_leaf(data)
+
 
+def _encode_structure(data: Union[Dict, List], indent: int = 0) -> str:
+    """Encode a non-empty dict or non-tabular list in YAML-like format."""
+    # Collect every line of the structure in one list and join once,
+    # instead of joining (and copying) again at each nesting level
+    lines = []
+    _append_nested(data, indent, lines)
+    return "\n".join(lines)
+
+
+def _encode_leaf(data: Any) -> str:
+    """Encode a primitive, an empty container or a tabular list."""
     if data is None:
         return "null"
     if isinstance(data, bool):
@@ -109,44 +171,41 @@ def encode_nested(data: Any, indent: int = 0) -> str:
             escaped = data.replace('"', '\\"')
             return f'"{escaped}"'
         return data
-
     if isinstance(data, list):
         if not data:
             return "[]"
+        return encode_tabular(data)
+    if isinstance(data, dict):
+        return "{}"
+    return str(data)
 
-        # Check if it's a tabular list
-        if is_tabular(data):
-            return encode_tabular(data)
 
-        # Otherwise, encode as YAML-like list
-        lines = []
+def _append_nested(data: Union[Dict, List], indent: int, lines: List[str]) -> None:
+    """Append the lines of a non-empty dict or non-tabular list to `lines`."""
+    prefix = "  " * indent
+
+    if isinstance(data, list):
         for item in data:
-            item_str = encode_nested(item, indent + 1)
             if isinstance(item, (dict, list)) and item:
-                lines.append(f"{prefix}- \n{item_str}")
-            else:
-                lines.append(f"{prefix}- {item_str}")
-        return "\n".join(lines)
-
-    if isinstance(data, dict):
-        if not data:
-            return "{}"
-
-        lines = []
-        for key, value in data.items():
-            # Check if value is a tabular list
-            if isinstance(value, list) and is_tabular(value):
-                tabular = encode_tabular(value, name=key)
-                lines.append(f"{prefix}{tabular}")
-            elif isinstance(value, (dict, list)) and value:
-                value_str = encode_nested(value, indent + 1)
-                lines.append(f"{prefix}{key}:\n{value_str}")
+                lines.append(f"{prefix}- ")
+                if isinstance(item, list) and is_tabular(item):
+                    lines.append(encode_tabular(item))
+                else:
+                    _append_nested(item, indent + 1, lines)
             else:
-                value_str = encode_nested(value, indent)
-                lines.append(f"{prefix}{key}: {value_str}")
-        return "\n".join(lines)
+                lines.append(f"{prefix}- {_encode_leaf(item)}")
+        return
 
-    return str(data)
+    for key, value in data.items():
+        # Check if value is a tabular list
+        if isinstance(value, list) and is_tabular(value):
+            tabular = encode_tabular(value, name=key)
+            lines.append(f"{prefix}{tabular}")
+        elif isinstance(value, (dict, list)) and value:
+            lines.append(f"{prefix}{key}:")
+            _append_nested(value, indent + 1, lines)
+        else:
+            lines.append(f"{prefix}{key}: {_encode_leaf(value)}")
 
 
 def encode(data: Any) -> str:
@@ -164,85 +223,92 @@ def encode(data: Any) -> str:
     """
     if isinstance(data, list) and is_tabular(data):
         return encode_tabular(data)
-    return encode_nested(data)
+    if isinstance(data, (dict, list)) and data:
+        # Already known not to be tabular: skip encode_nested's own check
+        return _encode_structure(data)
+    return _encode_leaf(data)
 
 
 def decode_tabular(text: str) -> List[Dict]:
     """Decode tabular TOON format back to list of dicts."""
-    lines = text.strip().split("\n")
-    if not lines:
-        return []
+    return list(decode_iter(text))
 
-    # Parse header: name[count]{field1,field2,...}:
-    header = lines[0]
 
-    # Extract fields from header
-    match = re.match(r"(?:(\w+))?\[(\d+)\]\{([^}]*)\}:", header)
+def decode_iter(source: Union[str, TextIO]) -> Iterator[Dict]:
+    """
+    Decode tabular TOON format lazily, yielding one dict per row.
+
+    Args:
+        source: TOON text, or an open text file positioned at the header
+
+    Yields:
+        One dict per data row
+    """
+    if isinstance(source, str):
+        # Split off the header line only; the rows are parsed straight from
+        # the rest of the text, without building a list of lines
+        header, _, body = source.strip().partition("\n")
+        rows = io.StringIO(body)
+    else:
+        # Read the file as a stream: only the current row is held in memory
+        rows = source
+        header = next((line for line in rows if line.strip()), "").strip()
+
+    # Parse header: name[count]{field1,field2,...}:
+    match = HEADER_RE.match(header)
     if not match:
         raise ValueError(f"Invalid TOON header: {header}")
 
     name, count, fields_str = match.groups()
-    expected_count = int(count)
     fields = [f.strip() for f in fields_str.split(",")] if fields_str else []
 
-    # Parse data rows
-    result = []
-    for line in lines[1:]:
-        if not line.strip():
+    # Parse data rows. Values are quoted the way csv does it (see
+    # escape_value), so the C csv parser handles quotes, doubled quotes
+    # and newlines inside quoted values
+    for values in csv.reader(rows, skipinitialspace=True):
+        if not values or (len(values) == 1 and not values[0].strip()):
             continue
+        yield _row_to_dict(fields, values)
 
-        # Parse CSV-like values (handling quoted strings)
-        values = []
-        current = ""
-        in_quotes = False
 
-        for char in line:
-            if char == '"':
-                if in_quotes and len(current) > 0 and current[-1] == '"':
-                    current += char
-                else:
-                    in_quotes = not in_quotes
-            elif char == "," and not in_quotes:
-                values.append(current)
-                current = ""
+def _may_be_number(val: str) -> bool:
+    """Check if int() or float() could accept a non-empty stripped value."""
+    # Numbers start with a digit, a sign or a dot; float() also accepts
+    # nan, inf and infinity in any case
+    first = val[0]
+    return first.isdigit() or first in "+-.nNiI"
+
+
+def _row_to_dict(fields: List[str], values: List[str]) -> Dict:
+    """Convert the raw values of one data row to a dict of typed values."""
+    clean_values = [v.strip() for v in values]
+
+    row_dict = {}
+    for i, field in enumerate(fields):
+        if i < len(clean_values):
+            val = clean_values[i]
+            # Try to convert to appropriate type
+            if val == "":
+                row_dict[field] = None
+            elif val == "true":
+                row_dict[field] = True
+            elif val == "false":
+                row_dict[field] = False
+            elif not _may_be_number(val):
+                # Skip the raised ValueErrors for plain text values
+                row_dict[field] = val
             else:
-                current += char
-        values.append(current)
-
-        # Clean up values
-        clean_values = []
-        for v in values:
-            v = v.strip()
-            if v.startswith('"') and v.endswith('"'):
-                v = v[1:-1].replace('""', '"')
-            clean_values.append(v)
-
-        # Create dict
-        row_dict = {}
-        for i, field in enumerate(fields):
-            if i < len(clean_values):
-                val = clean_values[i]
-                # Try to convert to appropriate type
-                if val == "":
-                    row_dict[field] = None
-                elif val == "true":
-                    row_dict[field] = True
-                elif val == "false":
-                    row_dict[field] = False
-                else:
+                try:
+                    row_dict[field] = int(val)
+                except ValueError:
                     try:
-                        row_dict[field] = int(val)
+                        row_dict[field] = float(val)
                     except ValueError:
-                        try:
-                            row_dict[field] = float(val)
-                        except ValueError:
-                            row_dict[field] = val
-            else:
-                row_dict[field] = None
-
-        result.append(row_dict)
+                        row_dict[field] = val
+        else:
+            row_dict[field] = None
 
-    return result
+    return row_dict
 
 
 def decode(text: str) -> Any:
@@ -254,7 +320,7 @@ def decode(text: str) -> Any:
     text = text.strip()
 
     # Check if it's tabular format
-    if re.match(r"(?:\w+)?\[\d+\]\{[^}]*\}:", text.split("\n")[0]):
+    if HEADER_RE.match(text.split("\n", 1)[0]):
         return decode_tabular(text)
 
     # For other formats, would need more complex parsing